@@ -0,0 +1,66 @@
+# src/ai4news/archive.py
+import gzip
+import json
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+PARTITION_PREFIX = "posts-"
+PARTITION_SUFFIX = ".ndjson.gz"
+
+
+def partition_for(scraped_at: str) -> str:
+    """Return the monthly partition file name for a scraped_at timestamp."""
+    return f"{PARTITION_PREFIX}{scraped_at[:7]}{PARTITION_SUFFIX}"
+
+
+def append_posts(archive_dir: Path, posts: Iterable[dict]) -> dict[str, int]:
+    """Append post records to their monthly gzipped NDJSON partitions.
+
+    Partitions are append-only: each call adds a new gzip member to the end of
+    the file, which gzip readers transparently concatenate.
+    Returns the number of records written per partition.
+    """
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    by_partition: dict[str, list[str]] = {}
+    for post in posts:
+        by_partition.setdefault(partition_for(post["scraped_at"]), []).append(
+            json.dumps(post, ensure_ascii=False)
+        )
+    for name, lines in by_partition.items():
+        with gzip.open(archive_dir / name, "at", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+    return {name: len(lines) for name, lines in by_partition.items()}
+
+
+def list_partitions(archive_dir: Path, since: str | None = None) -> list[Path]:
+    """List partition files in month order, skipping months before since."""
+    if not archive_dir.exists():
+        return []
+    paths = sorted(archive_dir.glob(f"{PARTITION_PREFIX}*{PARTITION_SUFFIX}"))
+    if since is not None:
+        paths = [p for p in paths if p.name >= partition_for(since)]
+    return paths
+
+
+def iter_partition(path: Path) -> Iterator[dict]:
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def iter_archived(archive_dir: Path, since: str | None = None) -> Iterator[dict]:
+    """Yield archived records scraped after since, oldest partition first.
+
+    A record can be written twice if archiving is interrupted between the
+    file append and the database commit, so repeats are dropped here.
+    """
+    seen: set[str] = set()
+    for path in list_partitions(archive_dir, since):
+        for record in iter_partition(path):
+            if since is not None and record["scraped_at"] <= since:
+                continue
+            if record["linkedin_id"] in seen:
+                continue
+            seen.add(record["linkedin_id"])
+            yield record
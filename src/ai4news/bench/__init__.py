@@ -0,0 +1 @@
+"""Synthetic-corpus benchmarks for ai4news storage and rendering."""
@@ -0,0 +1,122 @@
+# src/ai4news/bench/corpus.py
+import random
+from collections.abc import Iterator
+from datetime import datetime, timedelta
+
+POSTED_AT_FORMATS = ("iso", "iso_z", "date", "relative")
+LENGTH_DISTRIBUTIONS = ("uniform", "lognormal")
+
+_WORDS = (
+    "AI", "model", "launch", "agents", "research", "safety", "inference", "GPU",
+    "training", "benchmark", "open", "source", "team", "hiring", "product",
+    "customers", "enterprise", "latency", "context", "reasoning", "data",
+    "release", "partnership", "announce", "excited", "today", "new", "platform",
+    "developers", "evaluation", "scaling", "compute", "cloud", "API", "update",
+    "roadmap", "quarter", "growth", "startup", "funding", "policy", "future",
+)
+_TARGET_TYPES = ("company", "person")
+
+
+def make_targets(num_targets: int, seed: int = 0) -> list[dict]:
+    """Build target dicts shaped like entries of config/targets.yaml."""
+    rng = random.Random(seed)
+    targets = []
+    for i in range(num_targets):
+        target_type = rng.choice(_TARGET_TYPES)
+        slug = f"synthetic-{target_type}-{i:05d}"
+        prefix = "company" if target_type == "company" else "in"
+        targets.append({
+            "type": target_type,
+            "name": f"Synthetic {target_type.title()} {i}",
+            "url": f"https://www.linkedin.com/{prefix}/{slug}",
+        })
+    return targets
+
+
+def _text_length(rng: random.Random, text_length: tuple[int, int], distribution: str) -> int:
+    low, high = text_length
+    if distribution == "uniform":
+        return rng.randint(low, high)
+    # Most posts are short with a long tail, so centre the lognormal a third of
+    # the way into the range and clamp to the configured bounds.
+    mu = max(low, (low + high) / 3)
+    length = int(rng.lognormvariate(0, 0.6) * mu)
+    return min(max(length, low), high)
+
+
+def _make_text(rng: random.Random, length: int) -> str:
+    words: list[str] = []
+    size = 0
+    while size <= length:
+        word = rng.choice(_WORDS)
+        words.append(word)
+        size += len(word) + 1
+    return " ".join(words)[:length]
+
+
+def _format_posted_at(rng: random.Random, dt: datetime, fmt: str) -> str:
+    if fmt == "iso":
+        return dt.isoformat(timespec="seconds")
+    if fmt == "iso_z":
+        return dt.strftime("%Y-%m-%dT%H:%M:%S.000Z")
+    if fmt == "date":
+        return dt.strftime("%Y-%m-%d")
+    # LinkedIn's relative labels, as captured from the actor sub-description.
+    return rng.choice(("1h", "5h", "1d", "3d", "1w", "2w", "1mo"))
+
+
+def iter_posts(
+    targets: list[dict],
+    posts_per_target: int,
+    text_length: tuple[int, int] = (40, 500),
+    length_distribution: str = "lognormal",
+    media_max: int = 4,
+    media_probability: float = 0.4,
+    media_reuse: float = 0.2,
+    posted_at_formats: tuple[str, ...] = POSTED_AT_FORMATS,
+    seed: int = 0,
+) -> Iterator[tuple[int, dict]]:
+    """Yield (target_index, post) pairs for a seeded synthetic corpus.
+
+    Posts are yielded lazily so million-post corpora never live in memory at
+    once. Each post dict has the keys store_posts accepts. media_reuse is the
+    chance a media slot reuses a recently seen URL, as reshares do.
+    """
+    if length_distribution not in LENGTH_DISTRIBUTIONS:
+        raise ValueError(
+            f"Invalid length distribution: {length_distribution}. "
+            f"Must be one of: {LENGTH_DISTRIBUTIONS}"
+        )
+    for fmt in posted_at_formats:
+        if fmt not in POSTED_AT_FORMATS:
+            raise ValueError(
+                f"Invalid posted_at format: {fmt}. Must be one of: {POSTED_AT_FORMATS}"
+            )
+    rng = random.Random(seed)
+    now = datetime(2026, 2, 14, 12, 0, 0)
+    activity = 7_000_000_000_000_000_000
+    recent_media: list[str] = []
+    for _ in range(posts_per_target):
+        for i, target in enumerate(targets):
+            activity += 1
+            linkedin_id = f"urn:li:activity:{activity}"
+            media_count = rng.randint(1, media_max) if media_max and rng.random() < media_probability else 0
+            media_urls = []
+            for m in range(media_count):
+                if recent_media and rng.random() < media_reuse:
+                    media_urls.append(rng.choice(recent_media))
+                    continue
+                media_url = f"https://media.licdn.com/dms/image/synthetic/{activity}-{m}.jpg"
+                media_urls.append(media_url)
+                recent_media.append(media_url)
+                if len(recent_media) > 256:
+                    recent_media.pop(0)
+            posted = now - timedelta(minutes=rng.randint(0, 60 * 24 * 30))
+            yield i, {
+                "linkedin_id": linkedin_id,
+                "author": target["name"],
+                "text": _make_text(rng, _text_length(rng, text_length, length_distribution)),
+                "url": f"https://www.linkedin.com/feed/update/{linkedin_id}",
+                "media_urls": media_urls,
+                "posted_at": _format_posted_at(rng, posted, rng.choice(posted_at_formats)),
+            }
@@ -0,0 +1,259 @@
+# src/ai4news/bench/e2e.py
+import argparse
+import json
+import os
+import re
+import statistics
+import tempfile
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from html.parser import HTMLParser
+from pathlib import Path
+
+from ai4news import server
+from ai4news.bench.corpus import make_targets
+from ai4news.bench.fake_linkedin import DEFAULT_POSTS_PER_PAGE, FakeLinkedIn
+from ai4news.storage import Database
+
+DEFAULT_TARGETS = 20
+DEFAULT_LATENCY = 0.05
+DEFAULT_CONCURRENCY = 4
+# SKILL.md keeps the top 3 posts per page and the first 500 characters of each.
+EXTRACT_LIMIT = 3
+TEXT_LIMIT = 500
+
+_POST_CLASSES = {"feed-shared-update-v2", "occludable-update"}
+_AUTHOR_CLASSES = {
+    "update-components-actor__title", "update-components-actor__name", "feed-shared-actor__name",
+}
+_TEXT_CLASSES = {"feed-shared-update-v2__description", "update-components-text", "feed-shared-text"}
+_IMAGE_CLASSES = {"feed-shared-image__image"}
+_ACTIVITY_ID = re.compile(r"urn:li:activity:\d+")
+_VOID = {"img", "br", "hr", "meta", "link", "input", "source", "wbr"}
+
+
+class ActivityPageParser(HTMLParser):
+    """The SKILL.md evaluate_script extractor, re-expressed over static HTML.
+
+    Applies the same selectors and fallbacks so a page that parses here
+    yields what the skill would pass to store_posts.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.posts: list[dict] = []
+        self._stack: list[tuple[str, set[str]]] = []
+        self._post: dict | None = None
+        self._post_depth = 0
+        self._capture: str | None = None
+        self._capture_depth = 0
+        self._buffer: list[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        classes = set((attrs.get("class") or "").split())
+        if tag not in _VOID:
+            self._stack.append((tag, classes))
+        depth = len(self._stack)
+        if self._post is None:
+            if "urn:li:activity" in (attrs.get("data-urn") or "") or classes & _POST_CLASSES:
+                self._post = {"urn": attrs.get("data-urn") or "", "author": None, "text": None,
+                              "link": None, "time": None, "sub": None, "media_urls": []}
+                self._post_depth = depth
+            return
+        post = self._post
+        if tag == "img" and (
+            classes & _IMAGE_CLASSES
+            or any("update-components-image" in c for _, c in self._stack)
+        ):
+            if attrs.get("src"):
+                post["media_urls"].append(attrs["src"])
+        elif tag == "a" and post["link"] is None and "feed/update" in (attrs.get("href") or ""):
+            post["link"] = attrs["href"]
+        elif tag == "time" and post["time"] is None:
+            post["time"] = attrs.get("datetime")
+            self._start_capture("time", depth)
+        elif self._capture is None:
+            if (post["author"] is None and tag == "span" and attrs.get("aria-hidden") == "true"
+                    and any(c & _AUTHOR_CLASSES for _, c in self._stack[self._post_depth:-1])):
+                self._start_capture("author", depth)
+            elif post["text"] is None and classes & _TEXT_CLASSES:
+                self._start_capture("text", depth)
+            elif post["sub"] is None and "update-components-actor__sub-description" in classes:
+                self._start_capture("sub", depth)
+
+    def _start_capture(self, field: str, depth: int) -> None:
+        self._capture, self._capture_depth, self._buffer = field, depth, []
+
+    def handle_data(self, data):
+        if self._capture is not None:
+            self._buffer.append(data)
+
+    def handle_endtag(self, tag):
+        if tag in _VOID or not self._stack:
+            return
+        depth = len(self._stack)
+        self._stack.pop()
+        if self._capture is not None and depth == self._capture_depth:
+            value = "".join(self._buffer).strip()
+            if self._capture == "time":
+                self._post["time"] = self._post["time"] or value
+            else:
+                self._post[self._capture] = value
+            self._capture = None
+        if self._post is not None and depth == self._post_depth:
+            self.posts.append(self._post)
+            self._post = None
+
+
+def extract_posts(page: str, limit: int = EXTRACT_LIMIT) -> list[dict]:
+    """Extract the store_posts payload from an activity page's HTML."""
+    parser = ActivityPageParser()
+    parser.feed(page)
+    parser.close()
+    results = []
+    for raw in parser.posts:
+        match = _ACTIVITY_ID.search(raw["urn"])
+        if match is None:
+            continue
+        linkedin_id = match.group(0)
+        if raw["time"]:
+            posted_at = raw["time"]
+        elif raw["sub"]:
+            posted_at = raw["sub"].split("•")[0].strip()
+        else:
+            posted_at = ""
+        results.append({
+            "linkedin_id": linkedin_id,
+            "author": raw["author"] or "Unknown",
+            "text": (raw["text"] or "")[:TEXT_LIMIT],
+            "url": raw["link"] or f"https://www.linkedin.com/feed/update/{linkedin_id}",
+            "media_urls": raw["media_urls"],
+            "posted_at": posted_at,
+        })
+    return results[:limit]
+
+
+@contextmanager
+def _data_dir(path: Path):
+    previous = os.environ.get("AI4NEWS_DATA_DIR")
+    os.environ["AI4NEWS_DATA_DIR"] = str(path)
+    try:
+        yield
+    finally:
+        if previous is None:
+            os.environ.pop("AI4NEWS_DATA_DIR", None)
+        else:
+            os.environ["AI4NEWS_DATA_DIR"] = previous
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(pct * len(ordered)))]
+
+
+def run_e2e(
+    workdir: Path,
+    num_targets: int = DEFAULT_TARGETS,
+    posts_per_page: int = DEFAULT_POSTS_PER_PAGE,
+    latency: float = DEFAULT_LATENCY,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    seed: int = 0,
+) -> dict:
+    """Drive list_targets -> scrape -> store_posts -> get_new_posts ->
+    generate_newsletter against a FakeLinkedIn, through the MCP tool functions.
+
+    Each target is scraped and stored by one of `concurrency` workers, as
+    parallel browser tabs would. Returns per-stage timings, per-target
+    latency percentiles, throughput, and lost_posts, which must be zero.
+    """
+    targets = make_targets(num_targets, seed=seed)
+    db = Database(workdir / "ai4news.db")
+    try:
+        for t in targets:
+            db.upsert_target(url=t["url"], target_type=t["type"], name=t["name"])
+    finally:
+        db.close()
+
+    with _data_dir(workdir), FakeLinkedIn(targets, posts_per_page, latency, {"seed": seed}) as fake:
+
+        def scrape(target: dict) -> tuple[float, dict]:
+            start = time.perf_counter()
+            with urllib.request.urlopen(fake.local_url(target["activity_url"])) as resp:
+                posts = extract_posts(resp.read().decode("utf-8"))
+            result = server.store_posts(target_url=target["url"], posts=posts)
+            return time.perf_counter() - start, result
+
+        start = time.perf_counter()
+        listed = server.list_targets()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            scraped = list(pool.map(scrape, listed))
+        scrape_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        posts = server.get_new_posts(since_last_newsletter=True, include_media=False)
+        query_seconds = time.perf_counter() - start
+
+        for post in posts:
+            post["summary"] = post["text"][:80]
+        start = time.perf_counter()
+        newsletter = server.generate_newsletter(posts)
+        newsletter_seconds = time.perf_counter() - start
+        requests = fake.requests
+
+    per_target = [seconds for seconds, _ in scraped]
+    expected = num_targets * min(EXTRACT_LIMIT, posts_per_page)
+    new_posts = sum(r.get("new", 0) for _, r in scraped)
+    total = scrape_seconds + query_seconds + newsletter_seconds
+    return {
+        "targets": num_targets,
+        "requests": requests,
+        "posts_expected": expected,
+        "posts_new": new_posts,
+        "posts_in_newsletter": len(posts),
+        "lost_posts": expected - len(posts),
+        "errors": [e for _, r in scraped for e in r.get("errors", [r.get("error")]) if e],
+        "scrape_seconds": round(scrape_seconds, 4),
+        "get_new_posts_seconds": round(query_seconds, 4),
+        "generate_newsletter_seconds": round(newsletter_seconds, 4),
+        "total_seconds": round(total, 4),
+        "target_seconds_p50": round(statistics.median(per_target), 4) if per_target else 0.0,
+        "target_seconds_p95": round(_percentile(per_target, 0.95), 4),
+        "targets_per_second": round(num_targets / total, 2) if total else 0.0,
+        "newsletter": newsletter,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m ai4news.bench.e2e",
+        description="Run the ingest pipeline end to end against a local LinkedIn stand-in.",
+    )
+    parser.add_argument("--targets", type=int, default=DEFAULT_TARGETS)
+    parser.add_argument("--posts-per-page", type=int, default=DEFAULT_POSTS_PER_PAGE)
+    parser.add_argument("--latency", type=float, default=DEFAULT_LATENCY,
+                        help="seconds added to each page response")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--min-throughput", type=float, default=0.0,
+                        help="fail if targets/second falls below this")
+    args = parser.parse_args(argv)
+    with tempfile.TemporaryDirectory() as tmp:
+        result = run_e2e(Path(tmp), args.targets, args.posts_per_page, args.latency,
+                         args.concurrency, args.seed)
+    result.pop("newsletter")
+    print(json.dumps(result, indent=2))
+    failed = (
+        result["lost_posts"]
+        or result["errors"]
+        or result["targets_per_second"] < args.min_throughput
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,211 @@
+# src/ai4news/bench/fake_linkedin.py
+import argparse
+import html
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+from ai4news.bench.corpus import iter_posts, make_targets
+
+LINKEDIN_ORIGIN = "https://www.linkedin.com"
+DEFAULT_POSTS_PER_PAGE = 10
+
+PAGE_TEMPLATE = """\
+<!DOCTYPE html>
+<html lang="en">
+<head><meta charset="UTF-8"><title>{title} | LinkedIn</title></head>
+<body>
+<header class="global-nav"><a href="/feed/">Home</a> <a href="/mynetwork/">My Network</a></header>
+<main class="scaffold-layout__main">
+<h1 class="org-top-card-summary__title">{title}</h1>
+<div class="scaffold-finite-scroll__content">
+{posts}
+</div>
+</main>
+</body>
+</html>
+"""
+
+POST_TEMPLATE = """\
+<div class="feed-shared-update-v2 occludable-update" data-urn="{urn}">
+  <div class="update-components-actor">
+    <span class="update-components-actor__title"><span aria-hidden="true">{author}</span><span class="visually-hidden">{author}</span></span>
+    {when}
+  </div>
+  <div class="feed-shared-update-v2__description"><div class="update-components-text"><span dir="ltr">{text}</span></div></div>
+  {media}
+  <div class="feed-shared-social-action-bar"><a href="{url}">Comment</a></div>
+</div>"""
+
+LOGIN_WALL = """\
+<!DOCTYPE html>
+<html lang="en"><head><title>LinkedIn Login</title></head>
+<body><main><h1>Sign in</h1><p>New to LinkedIn? <a href="/signup">Join now</a></p></main></body>
+</html>
+"""
+
+
+def activity_path(target: dict) -> str:
+    """Path of a target's activity page, as server._build_activity_url builds it."""
+    path = urlsplit(target["url"]).path.rstrip("/")
+    if target["type"] == "person":
+        return f"{path}/recent-activity/all/"
+    if target["type"] == "company":
+        return f"{path}/posts/"
+    return path
+
+
+def render_post(post: dict) -> str:
+    posted_at = post["posted_at"]
+    if posted_at[:1].isdigit() and "-" in posted_at:
+        when = f'<time datetime="{html.escape(posted_at)}">{html.escape(posted_at[:10])}</time>'
+    else:
+        # Relative labels only appear in the actor sub-description.
+        when = (f'<span class="update-components-actor__sub-description">'
+                f'{html.escape(posted_at)} &bull; Visible to anyone</span>')
+    media = "".join(
+        f'<div class="update-components-image"><img src="{html.escape(u)}" alt=""></div>'
+        for u in post["media_urls"]
+    )
+    return POST_TEMPLATE.format(
+        urn=html.escape(post["linkedin_id"]),
+        author=html.escape(post["author"]),
+        text=html.escape(post["text"]),
+        url=html.escape(post["url"]),
+        when=when,
+        media=media,
+    )
+
+
+def render_page(title: str, posts: list[dict]) -> str:
+    return PAGE_TEMPLATE.format(
+        title=html.escape(title), posts="\n".join(render_post(p) for p in posts)
+    )
+
+
+class FakeLinkedIn:
+    """A local stand-in for LinkedIn activity pages, for offline pipeline runs.
+
+    Serves one page per target from the synthetic corpus, using the markup
+    the SKILL.md extractor targets. latency is added to every response and
+    requests are handled on their own threads, so concurrent scrapers see
+    overlapping waits the way they would against the real site. Use as a
+    context manager; base_url is set once the server is listening.
+    """
+
+    def __init__(
+        self,
+        targets: list[dict],
+        posts_per_page: int = DEFAULT_POSTS_PER_PAGE,
+        latency: float = 0.0,
+        corpus: dict | None = None,
+        login_wall: bool = False,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.targets = targets
+        self.latency = latency
+        self.login_wall = login_wall
+        self.requests = 0
+        posts: list[list[dict]] = [[] for _ in targets]
+        for i, post in iter_posts(targets, posts_per_page, **(corpus or {})):
+            posts[i].append(post)
+        self.pages = {
+            activity_path(t): render_page(t["name"], p).encode("utf-8")
+            for t, p in zip(targets, posts)
+        }
+        self.posts = {t["url"]: p for t, p in zip(targets, posts)}
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def local_url(self, url: str) -> str:
+        """Point a www.linkedin.com URL at this server."""
+        if url.startswith(LINKEDIN_ORIGIN):
+            return self.base_url + url[len(LINKEDIN_ORIGIN):]
+        return url
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                fake.requests += 1
+                if fake.latency:
+                    time.sleep(fake.latency)
+                if fake.login_wall:
+                    self._send(200, LOGIN_WALL.encode("utf-8"))
+                    return
+                page = fake.pages.get(urlsplit(self.path).path)
+                if page is None:
+                    self._send(404, b"Not found")
+                else:
+                    self._send(200, page)
+
+            def _send(self, status: int, body: bytes) -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> "FakeLinkedIn":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "FakeLinkedIn":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m ai4news.bench.fake_linkedin",
+        description="Serve synthetic LinkedIn activity pages for offline scraping.",
+    )
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--targets", type=int, default=10)
+    parser.add_argument("--posts-per-page", type=int, default=DEFAULT_POSTS_PER_PAGE)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to each response")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--login-wall", action="store_true", help="serve the sign-in page instead")
+    args = parser.parse_args(argv)
+    targets = make_targets(args.targets, seed=args.seed)
+    fake = FakeLinkedIn(
+        targets, args.posts_per_page, args.latency, corpus={"seed": args.seed},
+        login_wall=args.login_wall, port=args.port,
+    )
+    with fake:
+        for t in targets:
+            print(f"{t['type']:8} {t['name']:28} {fake.base_url}{activity_path(t)}")
+        print(f"Serving on {fake.base_url} (Ctrl-C to stop)")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,306 @@
+# src/ai4news/bench/runner.py
+import argparse
+import json
+import platform
+import sqlite3
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from datetime import datetime
+from pathlib import Path
+
+from ai4news.bench.corpus import (
+    LENGTH_DISTRIBUTIONS,
+    POSTED_AT_FORMATS,
+    iter_posts,
+    make_targets,
+)
+from ai4news.config import get_data_dir, get_project_root
+from ai4news.newsletter import generate_html, group_posts_by_target
+from ai4news.storage import Database
+from ai4news.topics import cluster_posts, document_terms
+from ai4news.transfer import export_store, import_store
+
+DEFAULT_SCALES = (1_000, 100_000, 1_000_000)
+DEFAULT_TARGETS = 50
+DEFAULT_TOLERANCE = 0.25
+# Sizes are deterministic for a seeded corpus, so they are held tighter than
+# timings and need no noise slack.
+DEFAULT_SIZE_TOLERANCE = 0.05
+SIZE_METRICS = ("output_bytes", "output_gzip_bytes", "index_bytes", "index_gzip_bytes")
+# Clustering compares every pair of posts, so it is measured on a
+# newsletter-sized week rather than the whole corpus.
+TOPIC_SAMPLE = 500
+# Absolute slack so millisecond-scale scenarios don't flap on timer noise.
+MIN_REGRESSION_SECONDS = 0.05
+MIN_REGRESSION_BYTES = 1024 * 1024
+
+
+def get_baseline_path() -> Path:
+    return get_project_root() / "benchmarks" / "baseline.json"
+
+
+def _measure(fn: Callable[[], object], profile_memory: bool) -> dict:
+    """Time one call of fn, then optionally re-run it under tracemalloc.
+
+    Timing and memory are taken from separate runs so tracemalloc's overhead
+    does not leak into the reported seconds. peak_bytes is the Python heap
+    peak; SQLite's own page cache is not traced.
+    """
+    start = time.perf_counter()
+    fn()
+    result = {"seconds": round(time.perf_counter() - start, 6)}
+    if profile_memory:
+        tracemalloc.start()
+        try:
+            fn()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        result["peak_bytes"] = peak
+    return result
+
+
+def _split_output_bytes(issue_dir: Path) -> dict:
+    """Sizes of a split newsletter: what a reader downloads first, and in total."""
+    files = [p for p in issue_dir.iterdir() if p.suffix != ".gz"]
+    gz = {p.name[:-3]: p.stat().st_size for p in issue_dir.glob("*.gz")}
+    return {
+        "index_bytes": (issue_dir / "index.html").stat().st_size + (issue_dir / "style.css").stat().st_size,
+        "index_gzip_bytes": gz["index.html"] + gz["style.css"],
+        "output_bytes": sum(p.stat().st_size for p in files),
+        "output_gzip_bytes": sum(gz.values()),
+    }
+
+
+def populate(db_path: Path, num_posts: int, num_targets: int, corpus: dict) -> int:
+    """Create a fresh database at db_path and fill it through insert_post."""
+    db_path.unlink(missing_ok=True)
+    num_targets = max(1, min(num_targets, num_posts))
+    targets = make_targets(num_targets, seed=corpus.get("seed", 0))
+    db = Database(db_path)
+    try:
+        target_ids = [
+            db.upsert_target(url=t["url"], target_type=t["type"], name=t["name"])
+            for t in targets
+        ]
+        inserted = 0
+        for i, post in iter_posts(targets, num_posts // num_targets, **corpus):
+            db.insert_post(target_id=target_ids[i], **post)
+            inserted += 1
+        return inserted
+    finally:
+        db.close()
+
+
+def run_scale(
+    num_posts: int,
+    workdir: Path,
+    num_targets: int = DEFAULT_TARGETS,
+    corpus: dict | None = None,
+    profile_memory: bool = True,
+) -> dict:
+    """Run every scenario against a num_posts corpus and return their metrics."""
+    corpus = corpus or {}
+    db_path = workdir / f"bench-{num_posts}.db"
+    out_dir = workdir / f"newsletters-{num_posts}"
+    results: dict[str, dict] = {}
+
+    results["insert_post"] = _measure(
+        lambda: populate(db_path, num_posts, num_targets, corpus), profile_memory
+    )
+
+    db = Database(db_path)
+    try:
+        posts = db.get_new_posts(since_days=7)
+        results["get_new_posts"] = _measure(lambda: db.get_new_posts(since_days=7), profile_memory)
+        results["get_new_posts_counts_only"] = _measure(
+            lambda: db.get_new_posts(since_days=7, include_media=False), profile_memory
+        )
+        results["get_new_posts_previews"] = _measure(
+            lambda: db.get_new_posts(since_days=7, include_media=False, include_text=False),
+            profile_memory,
+        )
+        week = posts[:TOPIC_SAMPLE]
+
+        def cluster():
+            df, documents = db.term_df(set().union(*(document_terms(p["text"]) for p in week)))
+            return cluster_posts(week, df, documents)
+
+        results["cluster_topics"] = _measure(cluster, profile_memory)
+    finally:
+        db.close()
+    export_path = workdir / f"export-{num_posts}.ndjson"
+    import_path = workdir / f"import-{num_posts}.db"
+
+    def export():
+        src = Database(db_path)
+        try:
+            with open(export_path, "wb") as out:
+                export_store(src, out)
+        finally:
+            src.close()
+
+    def load():
+        import_path.unlink(missing_ok=True)
+        dest = Database(import_path)
+        try:
+            import_store(dest, export_path)
+        finally:
+            dest.close()
+
+    results["export_ndjson"] = _measure(export, profile_memory)
+    results["import_ndjson"] = _measure(load, profile_memory)
+    results["group_posts_by_target"] = _measure(lambda: group_posts_by_target(posts), profile_memory)
+    results["generate_html"] = _measure(lambda: generate_html(posts, out_dir), profile_memory)
+    results["generate_html_split"] = _measure(
+        lambda: generate_html(posts, out_dir, split=True), profile_memory
+    )
+    results["generate_html"]["output_bytes"] = generate_html(posts, out_dir).stat().st_size
+    results["generate_html_split"].update(
+        _split_output_bytes(generate_html(posts, out_dir, split=True).parent)
+    )
+
+    for metrics in results.values():
+        if metrics["seconds"] > 0:
+            metrics["posts_per_second"] = round(len(posts) / metrics["seconds"], 1)
+    results["posts"] = len(posts)
+    results["db_bytes"] = db_path.stat().st_size
+    return results
+
+
+def run(
+    scales: tuple[int, ...] = DEFAULT_SCALES,
+    num_targets: int = DEFAULT_TARGETS,
+    corpus: dict | None = None,
+    profile_memory: bool = True,
+    workdir: Path | None = None,
+) -> dict:
+    """Run all scales and return a JSON-serialisable report."""
+    corpus = corpus or {}
+    report = {
+        "meta": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "targets": num_targets,
+            "corpus": corpus,
+        },
+        "results": {},
+    }
+    with tempfile.TemporaryDirectory(dir=workdir) as tmp:
+        for scale in scales:
+            report["results"][str(scale)] = run_scale(
+                scale, Path(tmp), num_targets, corpus, profile_memory
+            )
+    return report
+
+
+def compare_to_baseline(
+    report: dict,
+    baseline: dict,
+    tolerance: float = DEFAULT_TOLERANCE,
+    size_tolerance: float = DEFAULT_SIZE_TOLERANCE,
+) -> list[str]:
+    """Return a message for every metric that regressed beyond tolerance.
+
+    Timings and memory peaks are held to tolerance; the database file and
+    newsletter output sizes to size_tolerance. Only scales and scenarios
+    present in both reports are compared, so a quick 1k run can be checked
+    against a baseline that also covers 1M.
+    """
+    regressions = []
+
+    def check(name: str, scale: str, key: str, value: float, base: float,
+              limit: float, slack: float) -> None:
+        if value > base * (1 + limit) and value - base > slack:
+            regressions.append(
+                f"{name} @ {scale} posts: {key} {value} > baseline {base} (+{limit:.0%})"
+            )
+
+    for scale, scenarios in report.get("results", {}).items():
+        base_scenarios = baseline.get("results", {}).get(scale)
+        if not base_scenarios:
+            continue
+        if "db_bytes" in scenarios and "db_bytes" in base_scenarios:
+            check("database", scale, "db_bytes", scenarios["db_bytes"],
+                  base_scenarios["db_bytes"], size_tolerance, 0)
+        for name, metrics in scenarios.items():
+            base = base_scenarios.get(name)
+            if not isinstance(metrics, dict) or not isinstance(base, dict):
+                continue
+            limits = [("seconds", tolerance, MIN_REGRESSION_SECONDS),
+                      ("peak_bytes", tolerance, MIN_REGRESSION_BYTES)]
+            limits += [(key, size_tolerance, 0) for key in SIZE_METRICS]
+            for key, limit, slack in limits:
+                if key in metrics and key in base:
+                    check(name, scale, key, metrics[key], base[key], limit, slack)
+    return regressions
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="ai4news-bench",
+        description="Benchmark ai4news storage and rendering on a synthetic corpus.",
+    )
+    parser.add_argument("--scales", default=",".join(str(s) for s in DEFAULT_SCALES),
+                        help="comma-separated post counts (default: %(default)s)")
+    parser.add_argument("--targets", type=int, default=DEFAULT_TARGETS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--text-length", default="40,500", help="MIN,MAX characters")
+    parser.add_argument("--length-distribution", choices=LENGTH_DISTRIBUTIONS, default="lognormal")
+    parser.add_argument("--media-max", type=int, default=4)
+    parser.add_argument("--media-probability", type=float, default=0.4)
+    parser.add_argument("--posted-at-formats", default=",".join(POSTED_AT_FORMATS))
+    parser.add_argument("--no-memory", action="store_true", help="skip tracemalloc runs")
+    parser.add_argument("--output", type=Path, help="report path (default: data/bench/<timestamp>.json)")
+    parser.add_argument("--baseline", type=Path, default=get_baseline_path())
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--size-tolerance", type=float, default=DEFAULT_SIZE_TOLERANCE,
+                        help="allowed growth of database and output sizes")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="write this run to the baseline path instead of comparing")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    low, high = (int(x) for x in args.text_length.split(","))
+    corpus = {
+        "seed": args.seed,
+        "text_length": (low, high),
+        "length_distribution": args.length_distribution,
+        "media_max": args.media_max,
+        "media_probability": args.media_probability,
+        "posted_at_formats": tuple(args.posted_at_formats.split(",")),
+    }
+    scales = tuple(int(s) for s in args.scales.split(","))
+    report = run(scales, args.targets, corpus, profile_memory=not args.no_memory)
+
+    output = args.output
+    if output is None:
+        output = get_data_dir() / "bench" / f"{datetime.now():%Y-%m-%d_%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"Report written to {output}")
+
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}; skipping comparison.")
+        return 0
+    regressions = compare_to_baseline(
+        report, json.loads(args.baseline.read_text()), args.tolerance, args.size_tolerance
+    )
+    for line in regressions:
+        print(f"REGRESSION: {line}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,186 @@
+# src/ai4news/bench/stress.py
+import argparse
+import json
+import multiprocessing
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+from ai4news.bench.corpus import iter_posts, make_targets
+from ai4news.config import load_targets, save_targets, targets_lock
+from ai4news.storage import Database
+
+DEFAULT_PROCESSES = 8
+DEFAULT_POSTS = 500
+DEFAULT_TARGETS = 5
+# Posts per store_posts call; each call opens its own Database, as the server does.
+CALL_POSTS = 10
+
+# The schema ai4news shipped before any migration existed.
+LEGACY_SCHEMA = """
+    CREATE TABLE targets (id INTEGER PRIMARY KEY, url TEXT UNIQUE NOT NULL, type TEXT NOT NULL,
+                          name TEXT, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP);
+    CREATE TABLE posts (id INTEGER PRIMARY KEY,
+                        target_id INTEGER REFERENCES targets(id) ON DELETE CASCADE,
+                        linkedin_id TEXT UNIQUE, author TEXT, text TEXT, url TEXT,
+                        media_urls TEXT, posted_at TIMESTAMP,
+                        scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP);
+    CREATE TABLE newsletters (id INTEGER PRIMARY KEY, file_path TEXT NOT NULL,
+                              post_count INTEGER, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP);
+"""
+
+
+def _worker_target_url(worker: int, n: int) -> str:
+    return f"https://www.linkedin.com/in/stress-{worker}-{n}"
+
+
+def make_legacy_db(db_path: Path, posts: int, seed: int = 0) -> None:
+    """Write a file in the pre-migration schema holding posts from the synthetic corpus."""
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.executescript(LEGACY_SCHEMA)
+        targets = make_targets(1, seed=seed)
+        conn.execute(
+            "INSERT INTO targets (id, url, type, name) VALUES (1, ?, ?, ?)",
+            (targets[0]["url"], targets[0]["type"], targets[0]["name"]),
+        )
+        conn.executemany(
+            """INSERT INTO posts (target_id, linkedin_id, author, text, url, media_urls, posted_at)
+               VALUES (1, ?, ?, ?, ?, ?, ?)""",
+            [(p["linkedin_id"], p["author"], p["text"], p["url"], json.dumps(p["media_urls"]),
+              p["posted_at"]) for _, p in iter_posts(targets, posts, seed=seed)],
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _writer(db_path: Path, config_path: Path, worker: int, posts: int, targets: int) -> None:
+    """One server-like process: interleave YAML target edits with post inserts.
+
+    Like the MCP tools, every call opens and closes its own Database, and
+    each batch of inserts is followed by a read-only query.
+    """
+    target_ids = []
+    for n in range(targets):
+        url = _worker_target_url(worker, n)
+        with targets_lock(config_path):
+            current = load_targets(config_path)
+            current.append({"type": "person", "name": f"Stress {worker}-{n}", "url": url})
+            save_targets(current, config_path)
+        db = Database(db_path)
+        try:
+            target_ids.append(db.upsert_target(url=url, target_type="person", name=f"Stress {worker}-{n}"))
+        finally:
+            db.close()
+    for start in range(0, posts, CALL_POSTS):
+        db = Database(db_path)
+        try:
+            for i in range(start, min(start + CALL_POSTS, posts)):
+                linkedin_id = f"urn:li:activity:{worker:04d}{i:08d}"
+                db.insert_post(
+                    target_id=target_ids[i % targets],
+                    linkedin_id=linkedin_id,
+                    author=f"Stress {worker}",
+                    text=f"Post {i} from writer {worker}",
+                    url=f"https://www.linkedin.com/feed/update/{linkedin_id}",
+                    media_urls=["https://media.licdn.com/dms/image/shared.jpg"] if i % 3 == 0 else [],
+                    posted_at="2026-02-14T10:00:00",
+                )
+        finally:
+            db.close()
+        db = Database(db_path)
+        try:
+            db.get_new_posts(since_days=7, include_media=False)
+        finally:
+            db.close()
+
+
+def run_stress(
+    workdir: Path,
+    processes: int = DEFAULT_PROCESSES,
+    posts_per_process: int = DEFAULT_POSTS,
+    targets_per_process: int = DEFAULT_TARGETS,
+    legacy_posts: int = 0,
+) -> dict:
+    """Run concurrent writer processes against one database and targets file.
+
+    With legacy_posts, the database starts out in the pre-migration schema
+    holding that many posts, so every process's first open races to migrate
+    it. Returns throughput and the number of posts and YAML targets that
+    went missing; both lost counts must be zero for the run to pass.
+    """
+    db_path = workdir / "stress.db"
+    config_path = workdir / "targets.yaml"
+    save_targets([], config_path)
+    if legacy_posts:
+        make_legacy_db(db_path, legacy_posts)
+
+    ctx = multiprocessing.get_context("spawn")
+    workers = [
+        ctx.Process(
+            target=_writer,
+            args=(db_path, config_path, w, posts_per_process, targets_per_process),
+        )
+        for w in range(processes)
+    ]
+    start = time.perf_counter()
+    for p in workers:
+        p.start()
+    for p in workers:
+        p.join()
+    seconds = time.perf_counter() - start
+
+    db = Database(db_path)
+    try:
+        posts_stored = db.conn.execute("SELECT COUNT(*) FROM posts").fetchone()[0]
+        targets_in_db = db.conn.execute("SELECT COUNT(*) FROM targets").fetchone()[0]
+    finally:
+        db.close()
+    yaml_urls = {t["url"] for t in load_targets(config_path)}
+    expected_urls = {
+        _worker_target_url(w, n) for w in range(processes) for n in range(targets_per_process)
+    }
+    posts_expected = processes * posts_per_process + legacy_posts
+    return {
+        "processes": processes,
+        "failed_processes": sum(1 for p in workers if p.exitcode != 0),
+        "seconds": round(seconds, 3),
+        "posts_expected": posts_expected,
+        "posts_stored": posts_stored,
+        "lost_posts": posts_expected - posts_stored,
+        "posts_per_second": round(posts_stored / seconds, 1) if seconds else 0.0,
+        "targets_expected": len(expected_urls),
+        "targets_in_db": targets_in_db,
+        "lost_yaml_targets": len(expected_urls - yaml_urls),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m ai4news.bench.stress",
+        description="Stress concurrent ai4news writers on one database and targets file.",
+    )
+    parser.add_argument("--processes", type=int, default=DEFAULT_PROCESSES)
+    parser.add_argument("--posts", type=int, default=DEFAULT_POSTS, help="posts per process")
+    parser.add_argument("--targets", type=int, default=DEFAULT_TARGETS, help="YAML edits per process")
+    parser.add_argument("--legacy-posts", type=int, default=0,
+                        help="start from a pre-migration database holding this many posts")
+    parser.add_argument("--min-throughput", type=float, default=0.0,
+                        help="fail if posts/second falls below this")
+    args = parser.parse_args(argv)
+    with tempfile.TemporaryDirectory() as tmp:
+        result = run_stress(Path(tmp), args.processes, args.posts, args.targets, args.legacy_posts)
+    print(json.dumps(result, indent=2))
+    failed = (
+        result["failed_processes"]
+        or result["lost_posts"]
+        or result["lost_yaml_targets"]
+        or result["posts_per_second"] < args.min_throughput
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,75 @@
+# src/ai4news/bodies.py
+import hashlib
+import zlib
+
+try:  # Python 3.14+
+    from compression import zstd as _zstd
+
+    def _zstd_compress(data: bytes) -> bytes:
+        return _zstd.compress(data, level=9)
+
+    def _zstd_decompress(data: bytes) -> bytes:
+        return _zstd.decompress(data)
+except ImportError:
+    try:
+        import zstandard as _zstd
+
+        def _zstd_compress(data: bytes) -> bytes:
+            return _zstd.ZstdCompressor(level=9).compress(data)
+
+        def _zstd_decompress(data: bytes) -> bytes:
+            return _zstd.ZstdDecompressor().decompress(data)
+    except ImportError:
+        _zstd = None
+
+PREVIEW_LENGTH = 200
+# Bodies shorter than this rarely shrink once the codec header is added.
+MIN_COMPRESS_LENGTH = 64
+
+RAW = "raw"
+ZLIB = "zlib"
+ZSTD = "zstd"
+DEFAULT_CODEC = ZSTD if _zstd is not None else ZLIB
+
+
+def body_hash(text: str) -> bytes:
+    """Content address of a post body: the first 16 bytes of its SHA-256."""
+    return hashlib.sha256(text.encode("utf-8")).digest()[:16]
+
+
+def preview(text: str) -> str:
+    return text[:PREVIEW_LENGTH]
+
+
+def tail(text: str) -> str:
+    """The part of text not covered by its preview; only this is stored as a body."""
+    return text[PREVIEW_LENGTH:]
+
+
+def encode(text: str, codec: str = DEFAULT_CODEC) -> tuple[str, bytes]:
+    """Compress text, returning (codec, blob).
+
+    Falls back to storing the UTF-8 bytes as-is when compression would not
+    make the body smaller.
+    """
+    data = text.encode("utf-8")
+    if len(data) >= MIN_COMPRESS_LENGTH:
+        if codec == ZSTD and _zstd is not None:
+            packed = _zstd_compress(data)
+        else:
+            codec, packed = ZLIB, zlib.compress(data, 9)
+        if len(packed) < len(data):
+            return codec, packed
+    return RAW, data
+
+
+def decode(codec: str, blob: bytes) -> str:
+    if codec == RAW:
+        return blob.decode("utf-8")
+    if codec == ZLIB:
+        return zlib.decompress(blob).decode("utf-8")
+    if codec == ZSTD:
+        if _zstd is None:
+            raise RuntimeError("Post body is zstd-compressed but no zstd module is available")
+        return _zstd_decompress(blob).decode("utf-8")
+    raise ValueError(f"Unknown body codec: {codec}")
@@ -1,8 +1,18 @@
 # src/ai4news/config.py
+import os
+import shutil
+import tempfile
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
 
 import yaml
 
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, atomic rename still applies
+    fcntl = None
+
 VALID_TARGET_TYPES = {"person", "company", "hashtag"}
 
 
@@ -11,8 +21,9 @@ def get_project_root() -> Path:
 
 
 def get_data_dir() -> Path:
-    data_dir = get_project_root() / "data"
-    data_dir.mkdir(exist_ok=True)
+    """The runtime data directory: $AI4NEWS_DATA_DIR if set, else data/ in the project."""
+    data_dir = Path(os.environ.get("AI4NEWS_DATA_DIR") or get_project_root() / "data")
+    data_dir.mkdir(parents=True, exist_ok=True)
     return data_dir
 
 
@@ -40,7 +51,42 @@ def load_targets(path: Path | None = None) -> list[dict]:
 
 
 def save_targets(targets: list[dict], path: Path | None = None) -> None:
+    """Write targets atomically: readers see the old file or the new one, never a torn write."""
+    if path is None:
+        path = get_targets_path()
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            yaml.dump({"targets": targets}, f, default_flow_style=False)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates the file 0600; keep the permissions of the file it replaces.
+        if path.exists():
+            shutil.copymode(path, tmp)
+        else:
+            os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+@contextmanager
+def targets_lock(path: Path | None = None) -> Iterator[None]:
+    """Hold an exclusive advisory lock on the targets file.
+
+    Wrap a load_targets/save_targets read-modify-write in this so server
+    processes sharing one config cannot overwrite each other's changes.
+    The lock lives on a sidecar file because save_targets replaces the
+    targets file itself. Not re-entrant: do not nest within one process.
+    """
     if path is None:
         path = get_targets_path()
-    with open(path, "w") as f:
-        yaml.dump({"targets": targets}, f, default_flow_style=False)
+    with open(path.with_name(path.name + ".lock"), "a") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
@@ -0,0 +1,66 @@
+# src/ai4news/maintenance.py
+import argparse
+import json
+import statistics
+import time
+from pathlib import Path
+
+from ai4news.config import get_data_dir
+from ai4news.storage import Database
+
+DEFAULT_TIMING_RUNS = 5
+
+
+def time_hot_query(db: Database, runs: int = DEFAULT_TIMING_RUNS) -> float:
+    """Median seconds of the newsletter's get_new_posts query over runs calls."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        db.get_new_posts(since_days=7)
+        timings.append(time.perf_counter() - start)
+    return round(statistics.median(timings), 6)
+
+
+def maintain_db(db: Database, clean_orphans: bool = True,
+                timing_runs: int = DEFAULT_TIMING_RUNS) -> dict:
+    """Check, clean and compact the database, timing the hot query around it.
+
+    Runs the integrity and foreign-key checks, counts orphaned rows (and
+    deletes unreferenced bodies and media when clean_orphans is true),
+    refreshes planner statistics with ANALYZE and PRAGMA optimize, then
+    returns free pages to the filesystem with an incremental vacuum.
+    """
+    before = time_hot_query(db, timing_runs)
+    problems = db.integrity_problems()
+    orphans = db.find_orphans()
+    removed = db.delete_orphans() if clean_orphans else {}
+    db.optimize()
+    space = db.incremental_vacuum()
+    after = time_hot_query(db, timing_runs)
+    return {
+        "integrity_ok": not problems,
+        "integrity_problems": problems,
+        "orphans": orphans,
+        "orphans_removed": removed,
+        **space,
+        "get_new_posts_seconds": {"before": before, "after": after},
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="ai4news-maintain",
+        description="Check integrity, refresh statistics and compact the ai4news database.",
+    )
+    parser.add_argument("--db", type=Path, default=None, help="database path (default: data/ai4news.db)")
+    parser.add_argument("--keep-orphans", action="store_true",
+                        help="report unreferenced bodies and media without deleting them")
+    parser.add_argument("--timing-runs", type=int, default=DEFAULT_TIMING_RUNS)
+    args = parser.parse_args(argv)
+    db = Database(args.db or get_data_dir() / "ai4news.db")
+    try:
+        result = maintain_db(db, clean_orphans=not args.keep_orphans, timing_runs=args.timing_runs)
+    finally:
+        db.close()
+    print(json.dumps(result, indent=2))
+    return 0 if result["integrity_ok"] else 1
@@ -1,53 +1,130 @@
 # src/ai4news/newsletter.py
+import gzip
+import re
 from datetime import datetime
 from pathlib import Path
 
-from jinja2 import Environment
+from jinja2 import DictLoader, Environment
 
-NEWSLETTER_TEMPLATE = """\
-<!DOCTYPE html>
-<html lang="en">
-<head>
+TOP_MOVERS = 5
+LAYOUTS = ("target", "topic")
+
+STYLESHEET = """\
+* { margin: 0; padding: 0; box-sizing: border-box; }
+body { font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
+       max-width: 800px; margin: 0 auto; padding: 20px; background: #f5f5f5; color: #333; }
+.header { background: #0a66c2; color: white; padding: 24px; border-radius: 8px 8px 0 0;
+          margin-bottom: 0; }
+.header h1 { font-size: 24px; margin-bottom: 4px; }
+.header .meta { font-size: 14px; opacity: 0.9; }
+.header a { color: white; }
+.content { background: white; padding: 24px; border-radius: 0 0 8px 8px; }
+details { margin-bottom: 20px; }
+summary { font-size: 18px; font-weight: 600; cursor: pointer; padding: 12px 0;
+          border-bottom: 1px solid #e0e0e0; }
+summary:hover { color: #0a66c2; }
+.post { padding: 16px 0; border-bottom: 1px solid #f0f0f0; }
+.post:last-child { border-bottom: none; }
+details.post { margin-bottom: 0; }
+details.post summary { font-size: 15px; font-weight: 500; color: #0a66c2; border-bottom: none;
+                       padding: 0; }
+.post-date { font-size: 12px; color: #666; }
+.post-summary { font-size: 15px; font-weight: 500; margin: 6px 0; color: #0a66c2; }
+.post-text { font-size: 14px; color: #444; margin: 8px 0; line-height: 1.5;
+             white-space: pre-wrap; }
+.post-translation { font-size: 14px; color: #555; margin: 8px 0; padding: 8px 12px;
+                    background: #f8f9fa; border-left: 3px solid #0a66c2; line-height: 1.5; }
+.post-translation-label { font-size: 12px; color: #666; font-weight: 600; }
+.post-links { font-size: 13px; margin-top: 8px; }
+.post-links a { color: #0a66c2; text-decoration: none; margin-right: 16px; }
+.post-links a:hover { text-decoration: underline; }
+.media-badge { color: #666; font-size: 12px; }
+.post-sources { font-size: 13px; color: #666; margin-top: 8px; }
+.post-sources a { color: #0a66c2; text-decoration: none; }
+.activity { margin-bottom: 20px; padding-bottom: 12px; border-bottom: 1px solid #e0e0e0; }
+.activity h2 { font-size: 16px; margin-bottom: 8px; }
+.activity li { font-size: 14px; margin: 4px 0 4px 20px; }
+.activity .change { color: #666; font-size: 12px; }
+.index li { list-style: none; padding: 12px 0; border-bottom: 1px solid #f0f0f0; }
+.index a { font-size: 17px; font-weight: 600; color: #0a66c2; text-decoration: none; }
+.index .count { font-size: 13px; color: #666; }
+.footer { text-align: center; padding: 16px; font-size: 12px; color: #999; }
+.empty { text-align: center; padding: 40px; color: #999; }
+"""
+
+# Markup shared by the single-file newsletter and the split pages. The
+# per-post markup of the target layouts is written out in the templates'
+# loops instead: a macro call per post costs about a third of the render.
+MACROS = """\
+{% macro head(date, inline_style) %}
 <meta charset="UTF-8">
 <meta name="viewport" content="width=device-width, initial-scale=1.0">
 <title>AI4News Weekly - {{ date }}</title>
+{% if inline_style %}
 <style>
-  * { margin: 0; padding: 0; box-sizing: border-box; }
-  body { font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-         max-width: 800px; margin: 0 auto; padding: 20px; background: #f5f5f5; color: #333; }
-  .header { background: #0a66c2; color: white; padding: 24px; border-radius: 8px 8px 0 0;
-            margin-bottom: 0; }
-  .header h1 { font-size: 24px; margin-bottom: 4px; }
-  .header .meta { font-size: 14px; opacity: 0.9; }
-  .content { background: white; padding: 24px; border-radius: 0 0 8px 8px; }
-  details { margin-bottom: 20px; }
-  summary { font-size: 18px; font-weight: 600; cursor: pointer; padding: 12px 0;
-            border-bottom: 1px solid #e0e0e0; }
-  summary:hover { color: #0a66c2; }
-  .post { padding: 16px 0; border-bottom: 1px solid #f0f0f0; }
-  .post:last-child { border-bottom: none; }
-  .post-date { font-size: 12px; color: #666; }
-  .post-summary { font-size: 15px; font-weight: 500; margin: 6px 0; color: #0a66c2; }
-  .post-text { font-size: 14px; color: #444; margin: 8px 0; line-height: 1.5;
-               white-space: pre-wrap; }
-  .post-translation { font-size: 14px; color: #555; margin: 8px 0; padding: 8px 12px;
-                      background: #f8f9fa; border-left: 3px solid #0a66c2; line-height: 1.5; }
-  .post-translation-label { font-size: 12px; color: #666; font-weight: 600; }
-  .post-links { font-size: 13px; margin-top: 8px; }
-  .post-links a { color: #0a66c2; text-decoration: none; margin-right: 16px; }
-  .post-links a:hover { text-decoration: underline; }
-  .media-badge { color: #666; font-size: 12px; }
-  .footer { text-align: center; padding: 16px; font-size: 12px; color: #999; }
-  .empty { text-align: center; padding: 40px; color: #999; }
-</style>
+{{ stylesheet | safe }}</style>
+{% else %}
+<link rel="stylesheet" href="style.css">
+{% endif %}
+{% endmacro %}
+
+{% macro activity(top_movers) %}
+{% if top_movers %}
+<div class="activity">
+  <h2>Most active this week</h2>
+  <ol>
+    {% for t in top_movers %}
+    <li>{{ t.target_name }} &middot; {{ t.posts_this_period }} posts
+      <span class="change">({{ "%+d" | format(t.change) }} vs previous period)</span></li>
+    {% endfor %}
+  </ol>
+</div>
+{% endif %}
+{% endmacro %}
+
+{% macro post_body(post) %}
+    <div class="post-text">{{ post.text_preview }}</div>
+    {% if post.translation %}
+    <div class="post-translation-label">Translation:</div>
+    <div class="post-translation">{{ post.translation }}</div>
+    {% endif %}
+{% endmacro %}
+
+{% macro topic_post(group) %}
+{% set post = group.representative %}
+  <div class="post">
+    <div class="post-date">{{ post.posted_at_formatted }}</div>
+    <div class="post-summary">{{ post.summary }}</div>
+{{ post_body(post) }}
+    <div class="post-sources">Covered by:
+      {% for p in group.posts %}<a href="{{ p.url }}" target="_blank">{{ p.target_name or p.author }}</a>{% if not loop.last %}, {% endif %}{% endfor %}
+    </div>
+  </div>
+{% endmacro %}
+"""
+
+NEWSLETTER_TEMPLATE = """\
+{% from "macros.html" import head, activity, topic_post %}
+<!DOCTYPE html>
+<html lang="en">
+<head>
+{{ head(date, true) }}
 </head>
 <body>
 <div class="header">
   <h1>AI4News Weekly</h1>
-  <div class="meta">{{ date }} &middot; {{ total }} new posts from {{ group_count }} targets</div>
+  <div class="meta">{{ date }} &middot; {{ total }} new posts from {{ group_count }} {{ layout }}s</div>
 </div>
 <div class="content">
-{% if groups %}
+{{ activity(top_movers) }}
+{% if groups and layout == "topic" %}
+{% for group in groups %}
+<details open>
+  <summary>{{ group.topic }} ({{ group.posts | length }} posts)</summary>
+{{ topic_post(group) }}
+</details>
+{% endfor %}
+{% elif groups %}
 {% for group in groups %}
 <details open>
   <summary>{{ group.target_name }} ({{ group.posts | length }} posts)</summary>
@@ -62,7 +139,7 @@ NEWSLETTER_TEMPLATE = """\
     {% endif %}
     <div class="post-links">
       <a href="{{ post.url }}" target="_blank">&rarr; View original</a>
-      {% if post.media_urls %}<span class="media-badge">{{ post.media_urls | length }} media</span>{% endif %}
+      {% if post.media_count %}<span class="media-badge">{{ post.media_count }} media</span>{% endif %}
     </div>
   </div>
   {% endfor %}
@@ -77,6 +154,111 @@ NEWSLETTER_TEMPLATE = """\
 </html>
 """
 
+# Split output: a compact index linking to one page per group.
+INDEX_TEMPLATE = """\
+{% from "macros.html" import head, activity %}
+<!DOCTYPE html>
+<html lang="en">
+<head>
+{{ head(date, false) }}
+</head>
+<body>
+<div class="header">
+  <h1>AI4News Weekly</h1>
+  <div class="meta">{{ date }} &middot; {{ total }} new posts from {{ group_count }} {{ layout }}s</div>
+</div>
+<div class="content">
+{{ activity(top_movers) }}
+{% if groups %}
+<ul class="index">
+  {% for group in groups %}
+  <li>
+    <a href="{{ group.page }}">{{ group.title }}</a>
+    <span class="count">{{ group.posts | length }} posts</span>
+    {% if group.headline %}<div class="post-summary">{{ group.headline }}</div>{% endif %}
+  </li>
+  {% endfor %}
+</ul>
+{% else %}
+<div class="empty">0 new posts found this period.</div>
+{% endif %}
+</div>
+<div class="footer">Generated by ai4news</div>
+</body>
+</html>
+"""
+
+GROUP_TEMPLATE = """\
+{% from "macros.html" import head, topic_post %}
+<!DOCTYPE html>
+<html lang="en">
+<head>
+{{ head(date, false) }}
+</head>
+<body>
+<div class="header">
+  <h1>{{ group.title }}</h1>
+  <div class="meta"><a href="index.html">&larr; AI4News Weekly {{ date }}</a> &middot; {{ group.posts | length }} posts</div>
+</div>
+<div class="content">
+{% if layout == "topic" %}
+{{ topic_post(group) }}
+{% else %}
+{% for post in group.posts %}
+<details class="post">
+  <summary>{{ post.summary or post.posted_at_formatted }}</summary>
+  <div class="post-date">{{ post.posted_at_formatted }}</div>
+    <div class="post-text">{{ post.text_preview }}</div>
+    {% if post.translation %}
+    <div class="post-translation-label">Translation:</div>
+    <div class="post-translation">{{ post.translation }}</div>
+    {% endif %}
+    <div class="post-links">
+      <a href="{{ post.url }}" target="_blank">&rarr; View original</a>
+      {% if post.media_count %}<span class="media-badge">{{ post.media_count }} media</span>{% endif %}
+    </div>
+</details>
+{% endfor %}
+{% endif %}
+</div>
+<div class="footer">Generated by ai4news</div>
+</body>
+</html>
+"""
+
+
+def minify_markup(source: str) -> str:
+    """Strip indentation and line breaks between tags from template source.
+
+    Runs on templates rather than rendered pages, so post text -- shown with
+    white-space: pre-wrap -- keeps its own line breaks.
+    """
+    source = re.sub(r"\n[ \t]*", "\n", source)
+    source = re.sub(r"(>|%\})\n+(?=<|\{%)", r"\1", source)
+    return source.replace("\n", " ")
+
+
+def minify_css(css: str) -> str:
+    css = re.sub(r"\s+", " ", css)
+    return re.sub(r"\s*([{};:,])\s*", r"\1", css).replace(";}", "}").strip()
+
+
+_TEMPLATES = {
+    "macros.html": MACROS,
+    "newsletter.html": NEWSLETTER_TEMPLATE,
+    "index.html": INDEX_TEMPLATE,
+    "group.html": GROUP_TEMPLATE,
+}
+# Built once per process: compiling the templates costs more than rendering
+# a typical issue.
+_ENV = Environment(loader=DictLoader(_TEMPLATES), autoescape=True,
+                   trim_blocks=True, lstrip_blocks=True)
+_ENV.globals["stylesheet"] = STYLESHEET
+_MINIFIED_ENV = Environment(
+    loader=DictLoader({name: minify_markup(src) for name, src in _TEMPLATES.items()}),
+    autoescape=True,
+)
+
 
 def group_posts_by_target(posts: list[dict]) -> list[dict]:
     """Group a list of post dicts by their target_name, preserving order."""
@@ -93,38 +275,123 @@ def group_posts_by_target(posts: list[dict]) -> list[dict]:
     return list(groups.values())
 
 
-def generate_html(posts: list[dict], output_dir: Path) -> Path:
+def group_posts_by_topic(posts: list[dict]) -> list[dict]:
+    """Group a list of post dicts by their topic, preserving order.
+
+    Each group's representative is its first post carrying a summary, so
+    only one post per topic needs summarizing.
+    """
+    groups: dict[str, dict] = {}
+    for post in posts:
+        topic = post.get("topic") or "Other"
+        if topic not in groups:
+            groups[topic] = {"topic": topic, "representative": None, "posts": []}
+        groups[topic]["posts"].append(post)
+        if groups[topic]["representative"] is None and post.get("summary"):
+            groups[topic]["representative"] = post
+    for group in groups.values():
+        if group["representative"] is None:
+            group["representative"] = group["posts"][0]
+    return list(groups.values())
+
+
+def top_movers(stats: list[dict], limit: int = TOP_MOVERS) -> list[dict]:
+    """The most active targets from Database.get_target_stats output."""
+    active = [s for s in stats if s.get("posts_this_period")]
+    active.sort(key=lambda s: (s["posts_this_period"], s.get("change", 0)), reverse=True)
+    return active[:limit]
+
+
+def _prepare(post: dict) -> dict:
+    p = dict(post)
+    try:
+        dt = datetime.fromisoformat(p["posted_at"])
+        p["posted_at_formatted"] = dt.strftime("%b %d, %Y")
+    except (ValueError, KeyError):
+        p["posted_at_formatted"] = p.get("posted_at", "Unknown date")
+    text = p.get("text")
+    if text is None:
+        # Posts fetched with include_text=False carry a stored preview.
+        text = p.get("preview", "")
+        truncated = p.get("text_length", len(text)) > 200
+    else:
+        truncated = len(text) > 200
+    p["text_preview"] = text[:200] + "..." if truncated else text
+    if "media_count" not in p:
+        p["media_count"] = len(p.get("media_urls") or [])
+    return p
+
+
+def _page_name(n: int, title: str) -> str:
+    slug = re.sub(r"[^a-z0-9]+", "-", title.lower()).strip("-")[:40]
+    return f"{n:03d}-{slug or 'group'}.html"
+
+
+def _write_compressed(path: Path, data: str) -> None:
+    """Write data and a pre-gzipped companion next to it, for servers and mail
+    tools that can send .gz as-is."""
+    raw = data.encode("utf-8")
+    path.write_bytes(raw)
+    path.with_name(path.name + ".gz").write_bytes(gzip.compress(raw, compresslevel=9, mtime=0))
+
+
+def _write_split(groups: list[dict], issue_dir: Path, layout: str, context: dict) -> Path:
+    issue_dir.mkdir(parents=True, exist_ok=True)
+    for n, group in enumerate(groups, 1):
+        group["title"] = group["topic"] if layout == "topic" else group["target_name"]
+        group["page"] = _page_name(n, group["title"])
+        lead = group["representative"] if layout == "topic" else group["posts"][0]
+        group["headline"] = lead.get("summary")
+    _write_compressed(issue_dir / "style.css", minify_css(STYLESHEET))
+    group_template = _MINIFIED_ENV.get_template("group.html")
+    for group in groups:
+        _write_compressed(
+            issue_dir / group["page"],
+            group_template.render(group=group, date=context["date"], layout=layout),
+        )
+    index = issue_dir / "index.html"
+    _write_compressed(index, _MINIFIED_ENV.get_template("index.html").render(**context))
+    return index
+
+
+def generate_html(posts: list[dict], output_dir: Path, stats: list[dict] | None = None,
+                  layout: str = "target", split: bool = False) -> Path:
     """Render posts into a self-contained HTML newsletter file.
 
-    Returns the Path to the generated HTML file.
+    layout is "target" to group posts by who wrote them or "topic" to show
+    one summarized post per topic (see group_posts_by_topic). stats, if
+    given, is the output of Database.get_target_stats and adds a "Most
+    active this week" section.
+
+    With split=True the issue is written to its own directory instead: a
+    compact index.html linking to one page per group with collapsed posts,
+    a shared style.css, all minified and each with a .gz companion.
+    Returns the Path to the generated HTML file (index.html when split).
     """
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown newsletter layout: {layout}")
     output_dir.mkdir(parents=True, exist_ok=True)
     now = datetime.now()
     today = now.strftime("%Y-%m-%d")
 
-    processed: list[dict] = []
-    for post in posts:
-        p = dict(post)
-        try:
-            dt = datetime.fromisoformat(p["posted_at"])
-            p["posted_at_formatted"] = dt.strftime("%b %d, %Y")
-        except (ValueError, KeyError):
-            p["posted_at_formatted"] = p.get("posted_at", "Unknown date")
-        text = p.get("text", "")
-        p["text_preview"] = text[:200] + "..." if len(text) > 200 else text
-        processed.append(p)
-
-    groups = group_posts_by_target(processed)
-    env = Environment(autoescape=True)
-    template = env.from_string(NEWSLETTER_TEMPLATE)
-    html = template.render(
-        date=today,
-        total=len(posts),
-        group_count=len(groups),
-        groups=groups,
-    )
+    processed = [_prepare(post) for post in posts]
+    if layout == "topic":
+        groups = group_posts_by_topic(processed)
+    else:
+        groups = group_posts_by_target(processed)
+    context = {
+        "date": today,
+        "total": len(posts),
+        "group_count": len(groups),
+        "groups": groups,
+        "top_movers": top_movers(stats or []),
+        "layout": layout,
+    }
 
     timestamp = now.strftime("%Y-%m-%d_%H%M%S")
+    if split:
+        return _write_split(groups, output_dir / timestamp, layout, context)
+    html = _ENV.get_template("newsletter.html").render(**context)
     path = output_dir / f"{timestamp}.html"
     path.write_text(html, encoding="utf-8")
     return path
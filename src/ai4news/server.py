@@ -4,9 +4,11 @@ from pathlib import Path
 
 from mcp.server.fastmcp import FastMCP
 
-from ai4news.config import get_data_dir, load_targets, save_targets
-from ai4news.storage import Database
+from ai4news.config import get_data_dir, load_targets, save_targets, targets_lock
+from ai4news.storage import DEFAULT_RETENTION_DAYS, DEFAULT_STATS_DAYS, Database
+from ai4news.maintenance import maintain_db as run_maintenance
 from ai4news.newsletter import generate_html
+from ai4news.topics import DEFAULT_THRESHOLD
 
 mcp = FastMCP(
     name="ai4news",
@@ -82,29 +84,146 @@ def store_posts(target_url: str, posts: list[dict]) -> dict:
 
 
 @mcp.tool()
-def get_new_posts(since_days: int = 7) -> list[dict]:
+def get_new_posts(
+    since_days: int = 7,
+    include_media: bool = True,
+    since_last_newsletter: bool = False,
+    include_text: bool = True,
+) -> list[dict]:
     """Get posts scraped within the specified number of days.
-    Returns list of posts with author, text, url, media_urls, timestamps.
+    Returns list of posts with linkedin_id, author, text, preview, text_length, url,
+    media_count, media_urls, timestamps.
+    Pass include_media=False to get media_count only and skip the media URL lookup.
+    Pass include_text=False to get the 200-character preview only and skip decompressing
+    post bodies.
+    Pass since_last_newsletter=True to get exactly the posts not yet published in any
+    newsletter (since_days is then ignored).
     """
     db = _get_db()
     try:
-        return db.get_new_posts(since_days=since_days)
+        return db.get_new_posts(
+            since_days=since_days,
+            include_media=include_media,
+            since_last_newsletter=since_last_newsletter,
+            include_text=include_text,
+        )
     finally:
         db.close()
 
 
 @mcp.tool()
-def generate_newsletter(posts_with_summaries: list[dict]) -> str:
+def search_posts(query: str, since_days: int | None = None) -> list[dict]:
+    """Search post text and author for a substring (case-insensitive).
+    since_days limits the search to recently scraped posts; omit it to search the
+    full history, including archived posts.
+    """
+    db = _get_db()
+    try:
+        return db.search_posts(query, since_days=since_days)
+    finally:
+        db.close()
+
+
+@mcp.tool()
+def archive_posts(older_than_days: int = DEFAULT_RETENTION_DAYS) -> dict:
+    """Move posts scraped more than older_than_days ago into compressed monthly
+    archive files under data/archive/, then vacuum the database.
+    Archived posts stay readable through get_new_posts and search_posts.
+    Returns dict with archived count and records written per partition.
+    """
+    db = _get_db()
+    try:
+        return db.archive_posts(older_than_days=older_than_days)
+    finally:
+        db.close()
+
+
+@mcp.tool()
+def maintain_db(clean_orphans: bool = True) -> dict:
+    """Check and compact the database: integrity and foreign-key checks, orphaned
+    rows (unreferenced bodies and media are deleted unless clean_orphans is false),
+    ANALYZE/PRAGMA optimize, and an incremental vacuum.
+    Returns the problems found, orphan counts, bytes reclaimed, and get_new_posts
+    timings before and after.
+    """
+    db = _get_db()
+    try:
+        return run_maintenance(db, clean_orphans=clean_orphans)
+    finally:
+        db.close()
+
+
+@mcp.tool()
+def get_target_stats(days: int = DEFAULT_STATS_DAYS) -> list[dict]:
+    """Per-target activity, busiest first: total post_count, avg_length,
+    media_ratio, last_post_at, and posts_this_period vs posts_previous_period
+    (the last `days` days and the `days` before), with posts_per_day and change.
+    Read from aggregates maintained on every insert, so it is cheap at any size.
+    """
+    db = _get_db()
+    try:
+        return db.get_target_stats(days=days)
+    finally:
+        db.close()
+
+
+@mcp.tool()
+def get_topic_clusters(
+    since_days: int = 7,
+    since_last_newsletter: bool = False,
+    threshold: float = DEFAULT_THRESHOLD,
+) -> list[dict]:
+    """Cluster the posts get_new_posts would return into topics, largest first,
+    so each story is summarized once rather than once per target.
+    Each topic has topic_id, label, terms, a representative post with full text,
+    and posts: every member (representative included) with linkedin_id, author,
+    target_name, url, posted_at, preview and media_count.
+    Raise threshold (0-1) for tighter topics, lower it to merge more.
+    """
+    db = _get_db()
+    try:
+        topics = db.get_topic_clusters(
+            since_days=since_days,
+            since_last_newsletter=since_last_newsletter,
+            threshold=threshold,
+        )
+    finally:
+        db.close()
+    members = ("linkedin_id", "author", "target_name", "url", "posted_at", "preview", "media_count")
+    for topic in topics:
+        topic["posts"] = [{k: p.get(k) for k in members} for p in topic["posts"]]
+    return topics
+
+
+@mcp.tool()
+def generate_newsletter(
+    posts_with_summaries: list[dict], layout: str = "target", split: bool = False
+) -> str:
     """Receive posts with AI-generated summaries, render to HTML newsletter file.
-    Each post dict should have: author, target_name, text, summary, url, media_urls, posted_at.
+    Each post dict should have: linkedin_id, author, target_name, text, summary, url,
+    posted_at, and media_count (or media_urls).
     Optional: translation (for non-English posts).
+    With layout="topic", posts are grouped by their `topic` field (the label from
+    get_topic_clusters) and only one post per topic needs a summary.
+    With split=True, large issues are written as a compact index.html linking to one
+    minified page per group, with a shared stylesheet and .gz companions.
+    Posts are recorded as published, so get_new_posts(since_last_newsletter=True)
+    will not return them again.
+    The newsletter opens with the week's most active targets.
     Returns path to generated HTML file.
     """
     db = _get_db()
     output_dir = get_data_dir() / "newsletters"
     try:
-        path = generate_html(posts_with_summaries, output_dir)
-        db.record_newsletter(file_path=str(path), post_count=len(posts_with_summaries))
+        path = generate_html(
+            posts_with_summaries, output_dir, stats=db.get_target_stats(), layout=layout,
+            split=split,
+        )
+        db.record_newsletter(
+            file_path=str(path),
+            post_count=len(posts_with_summaries),
+            linkedin_ids=[p["linkedin_id"] for p in posts_with_summaries if p.get("linkedin_id")],
+        )
         return str(path)
     finally:
         db.close()
@@ -129,18 +248,19 @@ def add_target(url: str, target_type: str, name: str = "") -> dict:
         return {"error": f"Invalid type: {target_type}. Must be person, company, or hashtag."}
     db = _get_db()
     try:
-        targets = load_targets()
-        needs_yaml_update = not any(t["url"] == url for t in targets)
-        if needs_yaml_update:
-            targets.append({"type": target_type, "name": name, "url": url})
-            save_targets(targets)
-        tid = db.upsert_target(url=url, target_type=target_type, name=name)
+        with targets_lock():
+            targets = load_targets()
+            needs_yaml_update = not any(t["url"] == url for t in targets)
+            if needs_yaml_update:
+                targets.append({"type": target_type, "name": name, "url": url})
+                save_targets(targets)
+            try:
+                tid = db.upsert_target(url=url, target_type=target_type, name=name)
+            except Exception:
+                if needs_yaml_update:
+                    save_targets([t for t in targets if t["url"] != url])
+                raise
         return {"id": tid, "url": url, "type": target_type, "name": name}
-    except Exception:
-        if needs_yaml_update:
-            targets = [t for t in targets if t["url"] != url]
-            save_targets(targets)
-        raise
     finally:
         db.close()
 
@@ -150,11 +270,12 @@ def remove_target(url: str) -> dict:
     """Remove a LinkedIn target from monitoring."""
     db = _get_db()
     try:
-        targets_before = load_targets()
-        removed = db.remove_target(url)
-        if removed:
-            updated = [t for t in targets_before if t["url"] != url]
-            save_targets(updated)
+        with targets_lock():
+            targets_before = load_targets()
+            removed = db.remove_target(url)
+            if removed:
+                updated = [t for t in targets_before if t["url"] != url]
+                save_targets(updated)
         return {"removed": removed, "url": url}
     finally:
         db.close()
@@ -1,20 +1,154 @@
 # src/ai4news/storage.py
+import functools
+import hashlib
 import json
+import random
 import sqlite3
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from pathlib import Path
 
+from ai4news import archive, bodies, topics
+
+DEFAULT_RETENTION_DAYS = 90
+SCHEMA_VERSION = 9
+DEFAULT_STATS_DAYS = 7
+BUSY_TIMEOUT_SECONDS = 30.0
+BUSY_RETRIES = 5
+BUSY_BACKOFF_SECONDS = 0.05
+MEDIA_HASH_BYTES = 8
+POST_URL_PREFIX = "https://www.linkedin.com/feed/update/"
+
+
+def _is_busy(error: sqlite3.OperationalError) -> bool:
+    message = str(error).lower()
+    return "locked" in message or "busy" in message
+
+
+def _retry_on_busy(method):
+    """Retry a write method when another process holds the database lock.
+
+    The busy timeout already waits for most locks; this covers the cases
+    where SQLite reports SQLITE_BUSY without waiting, such as a WAL snapshot
+    that went stale. Calls made inside a transaction the caller already
+    opened are not retried, since rolling back would drop the caller's
+    earlier writes.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self.conn.in_transaction:
+            return method(self, *args, **kwargs)
+        delay = BUSY_BACKOFF_SECONDS
+        for attempt in range(BUSY_RETRIES):
+            try:
+                return method(self, *args, **kwargs)
+            except sqlite3.OperationalError as e:
+                if not _is_busy(e) or attempt == BUSY_RETRIES - 1:
+                    raise
+                if self.conn.in_transaction:
+                    self.conn.rollback()
+                time.sleep(delay * (1 + random.random()))
+                delay *= 2
+    return wrapper
+
+
+# When a post went out: its posted_at if SQLite can parse it (LinkedIn's
+# relative labels like "3d" cannot be), otherwise when it was scraped.
+_POST_TIME = "COALESCE(datetime({row}.posted_at), {row}.scraped_at)"
+_POST_DAY = "COALESCE(date({row}.posted_at), date({row}.scraped_at))"
+# A post's URL is nearly always its feed link, which the linkedin_id already
+# spells out, so that URL is stored as NULL and rebuilt on read.
+_POST_URL = f"COALESCE({{row}}.url, '{POST_URL_PREFIX}' || {{row}}.linkedin_id)"
+
+# Per-target aggregates maintained on every insert and delete, so reading
+# them costs O(targets) however long the history is. Covers the hot table:
+# archiving a post removes it from the stats like any other delete.
+_TARGET_STATS_TRIGGERS = f"""
+    CREATE TRIGGER IF NOT EXISTS trg_posts_stats_insert AFTER INSERT ON posts
+    WHEN NEW.target_id IS NOT NULL
+    BEGIN
+        INSERT INTO target_stats (target_id, post_count, total_length, media_posts, last_post_at)
+        VALUES (NEW.target_id, 1, NEW.text_length, NEW.media_count > 0,
+                {_POST_TIME.format(row="NEW")})
+        ON CONFLICT(target_id) DO UPDATE SET
+            post_count = post_count + 1,
+            total_length = total_length + excluded.total_length,
+            media_posts = media_posts + excluded.media_posts,
+            last_post_at = MAX(COALESCE(last_post_at, ''), excluded.last_post_at);
+        INSERT INTO target_daily_stats (target_id, day, post_count)
+        VALUES (NEW.target_id, {_POST_DAY.format(row="NEW")}, 1)
+        ON CONFLICT(target_id, day) DO UPDATE SET post_count = post_count + 1;
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS trg_posts_stats_delete AFTER DELETE ON posts
+    WHEN OLD.target_id IS NOT NULL
+    BEGIN
+        UPDATE target_stats SET
+            post_count = post_count - 1,
+            total_length = total_length - OLD.text_length,
+            media_posts = media_posts - (OLD.media_count > 0)
+        WHERE target_id = OLD.target_id;
+        UPDATE target_stats SET last_post_at =
+            (SELECT MAX({_POST_TIME.format(row="posts")}) FROM posts
+             WHERE posts.target_id = OLD.target_id)
+        WHERE target_id = OLD.target_id
+          AND last_post_at = {_POST_TIME.format(row="OLD")};
+        DELETE FROM target_stats WHERE target_id = OLD.target_id AND post_count <= 0;
+        UPDATE target_daily_stats SET post_count = post_count - 1
+        WHERE target_id = OLD.target_id AND day = {_POST_DAY.format(row="OLD")};
+        DELETE FROM target_daily_stats
+        WHERE target_id = OLD.target_id AND day = {_POST_DAY.format(row="OLD")}
+          AND post_count <= 0;
+    END;
+"""
+
+
+def _statements(script: str) -> Iterator[str]:
+    """Split an SQL script into statements, keeping trigger bodies whole.
+
+    executescript would commit any open transaction first, so scripts that
+    must run inside one are executed statement by statement instead.
+    """
+    statement = ""
+    for line in script.splitlines(keepends=True):
+        statement += line
+        if sqlite3.complete_statement(statement):
+            yield statement.strip()
+            statement = ""
+
 
 class Database:
-    def __init__(self, db_path: Path):
+    def __init__(self, db_path: Path, archive_dir: Path | None = None):
         self.db_path = db_path
-        self.conn = sqlite3.connect(str(db_path))
+        self.archive_dir = archive_dir or db_path.parent / "archive"
+        # Several server processes may share one file: wait on locks instead
+        # of failing, and take the write lock when a transaction begins so a
+        # reader never has to upgrade (the upgrade is what deadlocks).
+        self.conn = sqlite3.connect(
+            str(db_path), timeout=BUSY_TIMEOUT_SECONDS, isolation_level="IMMEDIATE"
+        )
         self.conn.row_factory = sqlite3.Row
         self.conn.execute("PRAGMA foreign_keys = ON")
-        self._create_tables()
+        self._configure()
+        self._migrate()
+
+    @_retry_on_busy
+    def _configure(self):
+        # Only takes effect on a file with no tables yet, and must come before
+        # the switch to WAL; existing files are converted by
+        # _migrate_auto_vacuum. Setting it on an existing file would take the
+        # write lock on every open.
+        if not self.conn.execute("SELECT 1 FROM sqlite_master LIMIT 1").fetchone():
+            self.conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        # WAL lets readers proceed while another process writes; NORMAL sync
+        # is durable across application crashes in WAL mode.
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
 
     def _create_tables(self):
-        self.conn.executescript("""
+        for statement in _statements("""
             CREATE TABLE IF NOT EXISTS targets (
                 id INTEGER PRIMARY KEY,
                 url TEXT UNIQUE NOT NULL,
@@ -28,46 +162,423 @@ class Database:
                 target_id INTEGER REFERENCES targets(id) ON DELETE CASCADE,
                 linkedin_id TEXT UNIQUE,
                 author TEXT,
-                text TEXT,
+                text_hash BLOB,
+                preview TEXT,
+                text_length INTEGER NOT NULL DEFAULT 0,
                 url TEXT,
-                media_urls TEXT,
+                media_count INTEGER NOT NULL DEFAULT 0,
                 posted_at TIMESTAMP,
                 scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             );
 
+            CREATE INDEX IF NOT EXISTS idx_posts_scraped_at ON posts(scraped_at);
+            CREATE INDEX IF NOT EXISTS idx_posts_target_id ON posts(target_id);
+
+            CREATE TABLE IF NOT EXISTS post_bodies (
+                hash BLOB PRIMARY KEY,
+                codec TEXT NOT NULL,
+                body BLOB NOT NULL
+            ) WITHOUT ROWID;
+
+            CREATE TABLE IF NOT EXISTS media (
+                hash BLOB PRIMARY KEY,
+                url TEXT NOT NULL
+            ) WITHOUT ROWID;
+
+            CREATE TABLE IF NOT EXISTS post_media (
+                post_id INTEGER NOT NULL REFERENCES posts(id) ON DELETE CASCADE,
+                position INTEGER NOT NULL,
+                media_hash BLOB NOT NULL REFERENCES media(hash),
+                PRIMARY KEY (post_id, position)
+            ) WITHOUT ROWID;
+
+            CREATE TABLE IF NOT EXISTS archived_posts (
+                linkedin_id TEXT PRIMARY KEY,
+                target_id INTEGER REFERENCES targets(id) ON DELETE CASCADE,
+                partition TEXT NOT NULL,
+                scraped_at TIMESTAMP
+            );
+
+            CREATE INDEX IF NOT EXISTS idx_archived_posts_scraped_at
+                ON archived_posts(scraped_at);
+
             CREATE TABLE IF NOT EXISTS newsletters (
                 id INTEGER PRIMARY KEY,
                 file_path TEXT NOT NULL,
                 post_count INTEGER,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                unpublished_from INTEGER
+            );
+
+            CREATE TABLE IF NOT EXISTS newsletter_posts (
+                post_id INTEGER NOT NULL REFERENCES posts(id) ON DELETE CASCADE,
+                newsletter_id INTEGER NOT NULL REFERENCES newsletters(id) ON DELETE CASCADE,
+                PRIMARY KEY (post_id, newsletter_id)
+            ) WITHOUT ROWID;
+
+            CREATE TABLE IF NOT EXISTS target_stats (
+                target_id INTEGER PRIMARY KEY REFERENCES targets(id) ON DELETE CASCADE,
+                post_count INTEGER NOT NULL DEFAULT 0,
+                total_length INTEGER NOT NULL DEFAULT 0,
+                media_posts INTEGER NOT NULL DEFAULT 0,
+                last_post_at TIMESTAMP
+            );
+
+            CREATE TABLE IF NOT EXISTS target_daily_stats (
+                target_id INTEGER NOT NULL REFERENCES targets(id) ON DELETE CASCADE,
+                day TEXT NOT NULL,
+                post_count INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (target_id, day)
+            ) WITHOUT ROWID;
+
+            CREATE TABLE IF NOT EXISTS term_df (
+                term TEXT PRIMARY KEY,
+                df INTEGER NOT NULL
+            ) WITHOUT ROWID;
+
+            CREATE TABLE IF NOT EXISTS term_corpus (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                documents INTEGER NOT NULL
+            );
+
+            CREATE TABLE IF NOT EXISTS import_progress (
+                source TEXT PRIMARY KEY,
+                byte_offset INTEGER NOT NULL,
+                records INTEGER NOT NULL,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             );
-        """)
+        """):
+            self.conn.execute(statement)
+
+    def _schema_version(self) -> int:
+        return self.conn.execute("PRAGMA user_version").fetchone()[0]
+
+    @_retry_on_busy
+    def _migrate(self):
+        """Create the tables and bring older files up to SCHEMA_VERSION.
+
+        Opening a current file only reads user_version, so read-only callers
+        never wait on a writer. Otherwise everything runs in one transaction
+        holding the write lock, and the version is read again once the lock
+        is held: when several processes open an old file at once, one of them
+        migrates and the others find the work done. Migrations that rebuild
+        tables ask for a VACUUM, which cannot run inside a transaction.
+        """
+        if self._schema_version() >= SCHEMA_VERSION:
+            return
+        rebuilt = False
+        with self._schema_transaction():
+            version = self._schema_version()
+            if version >= SCHEMA_VERSION:
+                return
+            self._create_tables()
+            if version < 1:
+                rebuilt |= self._migrate_media_table()
+            if version < 2:
+                self._migrate_newsletter_posts()
+            if version < 3:
+                rebuilt |= self._migrate_post_bodies()
+            if version < 4:
+                self._migrate_target_stats()
+            if version < 5:
+                self._migrate_term_df()
+            if version < 6:
+                rebuilt |= self._migrate_auto_vacuum()
+            if version < 7:
+                rebuilt |= self._migrate_media_hashes()
+            if version < 8:
+                rebuilt |= self._migrate_post_bodies_without_rowid()
+            if version < 9:
+                self._migrate_canonical_post_urls()
+            self.conn.execute(
+                """CREATE INDEX IF NOT EXISTS idx_posts_text_hash ON posts(text_hash)
+                   WHERE text_hash IS NOT NULL"""
+            )
+            self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        if rebuilt:
+            self.conn.execute("VACUUM")
+
+    @contextmanager
+    def _schema_transaction(self):
+        """Run a schema change atomically.
+
+        In its legacy transaction mode sqlite3 only opens a transaction before
+        INSERT, UPDATE and DELETE, so ALTER and CREATE under `with self.conn`
+        would each commit on their own. Beginning explicitly covers them too.
+        """
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self.conn.rollback()
+            raise
         self.conn.commit()
 
-    def upsert_target(self, url: str, target_type: str, name: str = "") -> int:
-        cur = self.conn.execute("SELECT id FROM targets WHERE url = ?", (url,))
-        row = cur.fetchone()
-        if row:
+    def _migrate_media_table(self) -> bool:
+        """Move the posts.media_urls JSON column into media/post_media."""
+        columns = {row["name"] for row in self.conn.execute("PRAGMA table_info(posts)")}
+        if "media_urls" not in columns:
+            return False
+        if "media_count" not in columns:
             self.conn.execute(
-                "UPDATE targets SET type = ?, name = ? WHERE id = ?",
-                (target_type, name, row["id"]),
+                "ALTER TABLE posts ADD COLUMN media_count INTEGER NOT NULL DEFAULT 0"
             )
+        rows = self.conn.execute(
+            "SELECT id, media_urls FROM posts WHERE media_urls NOT IN ('', '[]')"
+        ).fetchall()
+        for row in rows:
+            media_urls = json.loads(row["media_urls"]) or []
+            self._insert_media(row["id"], media_urls)
+            self.conn.execute(
+                "UPDATE posts SET media_count = ? WHERE id = ?",
+                (len(media_urls), row["id"]),
+            )
+        self.conn.execute("ALTER TABLE posts DROP COLUMN media_urls")
+        return True
+
+    def _migrate_newsletter_posts(self):
+        """Backfill newsletter membership for issues recorded before newsletter_posts.
+
+        Older versions only stored a count, so each post is assigned to the
+        first newsletter generated after it was scraped -- what a rolling
+        since_days window would have picked up.
+        """
+        columns = {row["name"] for row in self.conn.execute("PRAGMA table_info(newsletters)")}
+        if "unpublished_from" in columns:
+            return
+        self.conn.execute("ALTER TABLE newsletters ADD COLUMN unpublished_from INTEGER")
+        self.conn.execute(
+            """INSERT OR IGNORE INTO newsletter_posts (post_id, newsletter_id)
+               SELECT p.id,
+                      (SELECT n.id FROM newsletters n
+                       WHERE n.created_at >= p.scraped_at
+                       ORDER BY n.created_at LIMIT 1) AS newsletter_id
+               FROM posts p
+               WHERE newsletter_id IS NOT NULL"""
+        )
+        latest = self.conn.execute(
+            "SELECT id FROM newsletters ORDER BY id DESC LIMIT 1"
+        ).fetchone()
+        if latest:
+            self._advance_watermark(latest["id"], 0)
+
+    def _migrate_post_bodies(self) -> bool:
+        """Move inline posts.text into compressed, content-addressed post_bodies."""
+        columns = {row["name"] for row in self.conn.execute("PRAGMA table_info(posts)")}
+        if "text" not in columns:
+            return False
+        for column, decl in (("text_hash", "BLOB"), ("preview", "TEXT"),
+                             ("text_length", "INTEGER NOT NULL DEFAULT 0")):
+            if column not in columns:
+                self.conn.execute(f"ALTER TABLE posts ADD COLUMN {column} {decl}")
+        rows = self.conn.execute("SELECT id, text FROM posts").fetchall()
+        for row in rows:
+            text = row["text"] or ""
+            text_hash = self._body_hash(text)
+            if text_hash is not None:
+                self._store_body(text, text_hash)
+            self.conn.execute(
+                "UPDATE posts SET text_hash = ?, preview = ?, text_length = ? WHERE id = ?",
+                (text_hash, bodies.preview(text), len(text), row["id"]),
+            )
+        self.conn.execute("ALTER TABLE posts DROP COLUMN text")
+        return True
+
+    def _migrate_target_stats(self):
+        """Install the triggers that keep target_stats current and backfill it.
+
+        The triggers are created here rather than in _create_tables because
+        they reference columns that earlier migrations add.
+        """
+        self.rebuild_target_stats(commit=False)
+        for statement in _statements(_TARGET_STATS_TRIGGERS):
+            self.conn.execute(statement)
+
+    def rebuild_target_stats(self, commit: bool = True) -> None:
+        """Recompute target_stats and target_daily_stats from the posts table."""
+        self.conn.execute("DELETE FROM target_stats")
+        self.conn.execute("DELETE FROM target_daily_stats")
+        self.conn.execute(
+            f"""INSERT INTO target_stats
+                (target_id, post_count, total_length, media_posts, last_post_at)
+                SELECT target_id, COUNT(*), SUM(text_length),
+                       SUM(media_count > 0), MAX({_POST_TIME.format(row="posts")})
+                FROM posts WHERE target_id IS NOT NULL GROUP BY target_id"""
+        )
+        self.conn.execute(
+            f"""INSERT INTO target_daily_stats (target_id, day, post_count)
+                SELECT target_id, {_POST_DAY.format(row="posts")} AS day, COUNT(*)
+                FROM posts WHERE target_id IS NOT NULL GROUP BY target_id, day"""
+        )
+        if commit:
             self.conn.commit()
-            return row["id"]
-        cur = self.conn.execute(
-            "INSERT INTO targets (url, type, name) VALUES (?, ?, ?)",
+
+    def _migrate_term_df(self):
+        """Backfill topic document frequencies from the stored posts."""
+        self.conn.execute("DELETE FROM term_df")
+        self.conn.execute("DELETE FROM term_corpus")
+        for post in self.iter_posts():
+            self._count_terms(post["text"])
+
+    def _migrate_auto_vacuum(self) -> bool:
+        """Switch older files to incremental auto-vacuum, which needs one full VACUUM."""
+        if self.conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+            return False
+        self.conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        return True
+
+    def _migrate_media_hashes(self) -> bool:
+        """Re-key media on a short URL hash instead of a rowid plus a UNIQUE url index."""
+        columns = {row["name"] for row in self.conn.execute("PRAGMA table_info(media)")}
+        if "id" not in columns:
+            return False
+        # Renaming media repoints post_media's foreign key at media_v6.
+        self.conn.execute("ALTER TABLE media RENAME TO media_v6")
+        self.conn.execute("ALTER TABLE post_media RENAME TO post_media_v6")
+        self.conn.execute(
+            "CREATE TABLE media (hash BLOB PRIMARY KEY, url TEXT NOT NULL) WITHOUT ROWID"
+        )
+        self.conn.execute(
+            """CREATE TABLE post_media (
+                   post_id INTEGER NOT NULL REFERENCES posts(id) ON DELETE CASCADE,
+                   position INTEGER NOT NULL,
+                   media_hash BLOB NOT NULL REFERENCES media(hash),
+                   PRIMARY KEY (post_id, position)
+               ) WITHOUT ROWID"""
+        )
+        hashes = {}
+        for row in self.conn.execute("SELECT id, url FROM media_v6").fetchall():
+            hashes[row["id"]] = self._media_hash(row["url"])
+            self.conn.execute(
+                "INSERT OR IGNORE INTO media (hash, url) VALUES (?, ?)",
+                (hashes[row["id"]], row["url"]),
+            )
+        self.conn.executemany(
+            "INSERT INTO post_media (post_id, position, media_hash) VALUES (?, ?, ?)",
+            [(row["post_id"], row["position"], hashes[row["media_id"]])
+             for row in self.conn.execute("SELECT * FROM post_media_v6")],
+        )
+        self.conn.execute("DROP TABLE post_media_v6")
+        self.conn.execute("DROP TABLE media_v6")
+        return True
+
+    def _migrate_post_bodies_without_rowid(self) -> bool:
+        """Rebuild post_bodies clustered on its hash, dropping the rowid and its separate index."""
+        sql = self.conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'post_bodies'"
+        ).fetchone()[0]
+        if "WITHOUT ROWID" in sql.upper():
+            return False
+        self.conn.execute("ALTER TABLE post_bodies RENAME TO post_bodies_v7")
+        self.conn.execute(
+            """CREATE TABLE post_bodies (
+                   hash BLOB PRIMARY KEY,
+                   codec TEXT NOT NULL,
+                   body BLOB NOT NULL
+               ) WITHOUT ROWID"""
+        )
+        self.conn.execute(
+            "INSERT INTO post_bodies (hash, codec, body) SELECT hash, codec, body FROM post_bodies_v7"
+        )
+        self.conn.execute("DROP TABLE post_bodies_v7")
+        return True
+
+    def _migrate_canonical_post_urls(self):
+        """Drop stored post URLs that are just the feed link for the linkedin_id."""
+        self.conn.execute(
+            "UPDATE posts SET url = NULL WHERE url = ? || linkedin_id", (POST_URL_PREFIX,)
+        )
+
+    def _count_terms(self, text: str) -> None:
+        self.conn.executemany(
+            """INSERT INTO term_df (term, df) VALUES (?, 1)
+               ON CONFLICT(term) DO UPDATE SET df = df + 1""",
+            [(t,) for t in topics.document_terms(text)],
+        )
+        self.conn.execute(
+            """INSERT INTO term_corpus (id, documents) VALUES (1, 1)
+               ON CONFLICT(id) DO UPDATE SET documents = documents + 1"""
+        )
+
+    @staticmethod
+    def _body_hash(text: str) -> bytes | None:
+        # Text that fits in the preview column is served from it directly and
+        # gets no body row.
+        if len(text) <= bodies.PREVIEW_LENGTH:
+            return None
+        return bodies.body_hash(text)
+
+    def _store_body(self, text: str, digest: bytes) -> None:
+        """Store the part of text beyond its preview once, under the full text's hash.
+
+        Compression only runs the first time a body is seen, so reshares and
+        cross-posts of the same text cost one index probe.
+        """
+        if not self.conn.execute(
+            "SELECT 1 FROM post_bodies WHERE hash = ?", (digest,)
+        ).fetchone():
+            codec, blob = bodies.encode(bodies.tail(text))
+            self.conn.execute(
+                "INSERT INTO post_bodies (hash, codec, body) VALUES (?, ?, ?)",
+                (digest, codec, blob),
+            )
+
+    def _delete_orphan_bodies(self, hashes: set[bytes]) -> None:
+        self.conn.executemany(
+            """DELETE FROM post_bodies WHERE hash = ? AND NOT EXISTS
+                   (SELECT 1 FROM posts WHERE text_hash = ?)""",
+            [(h, h) for h in hashes],
+        )
+
+    @staticmethod
+    def _media_hash(url: str) -> bytes:
+        # Eight bytes keep post_media rows small; a collision needs billions
+        # of distinct URLs to become likely.
+        return hashlib.sha256(url.encode("utf-8")).digest()[:MEDIA_HASH_BYTES]
+
+    def _insert_media(self, post_id: int, media_urls: list[str]) -> None:
+        hashes = [self._media_hash(u) for u in media_urls]
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO media (hash, url) VALUES (?, ?)",
+            zip(hashes, media_urls),
+        )
+        self.conn.executemany(
+            "INSERT INTO post_media (post_id, position, media_hash) VALUES (?, ?, ?)",
+            [(post_id, i, h) for i, h in enumerate(hashes)],
+        )
+
+    @_retry_on_busy
+    def upsert_target(self, url: str, target_type: str, name: str = "",
+                      commit: bool = True) -> int:
+        # A single statement, so concurrent processes adding the same URL
+        # cannot both miss the SELECT and collide on the UNIQUE constraint.
+        self.conn.execute(
+            """INSERT INTO targets (url, type, name) VALUES (?, ?, ?)
+               ON CONFLICT(url) DO UPDATE SET type = excluded.type, name = excluded.name""",
             (url, target_type, name),
         )
-        self.conn.commit()
-        return cur.lastrowid
+        row = self.conn.execute("SELECT id FROM targets WHERE url = ?", (url,)).fetchone()
+        if commit:
+            self.conn.commit()
+        return row["id"]
 
+    @_retry_on_busy
     def remove_target(self, url: str) -> bool:
         cur = self.conn.execute("SELECT id FROM targets WHERE url = ?", (url,))
         row = cur.fetchone()
         if not row:
             return False
-        self.conn.execute("DELETE FROM posts WHERE target_id = ?", (row["id"],))
+        hashes = {
+            r[0] for r in self.conn.execute(
+                """SELECT DISTINCT text_hash FROM posts
+                   WHERE target_id = ? AND text_hash IS NOT NULL""",
+                (row["id"],),
+            )
+        }
+        # Posts, their media links, newsletter membership, archive index rows
+        # and stats all go with the target through ON DELETE CASCADE.
         self.conn.execute("DELETE FROM targets WHERE id = ?", (row["id"],))
+        self._delete_orphan_bodies(hashes)
         self.conn.commit()
         return True
 
@@ -75,6 +586,7 @@ class Database:
         cur = self.conn.execute("SELECT id, url, type, name, created_at FROM targets")
         return [dict(row) for row in cur.fetchall()]
 
+    @_retry_on_busy
     def insert_post(
         self,
         target_id: int,
@@ -84,45 +596,608 @@ class Database:
         url: str,
         media_urls: list[str],
         posted_at: str,
+        scraped_at: str | None = None,
+        commit: bool = True,
     ) -> bool:
+        """Insert one post, returning False if its linkedin_id is already stored.
+
+        scraped_at defaults to now. With commit=False the caller owns the
+        transaction, which lets bulk loaders batch many inserts per commit.
+        """
+        text = text or ""
+        media_urls = media_urls or []
+        text_hash = self._body_hash(text)
+        if url == POST_URL_PREFIX + linkedin_id:
+            url = None
+        # Archived posts no longer hold the UNIQUE slot in posts, so check the
+        # archive index too or a re-scrape would resurrect them.
         try:
-            self.conn.execute(
+            cur = self.conn.execute(
                 """INSERT INTO posts
-                   (target_id, linkedin_id, author, text, url, media_urls, posted_at)
-                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
-                (target_id, linkedin_id, author, text, url,
-                 json.dumps(media_urls), posted_at),
+                   (target_id, linkedin_id, author, text_hash, preview, text_length,
+                    url, media_count, posted_at, scraped_at)
+                   SELECT ?, ?, ?, ?, ?, ?, ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP)
+                   WHERE NOT EXISTS
+                       (SELECT 1 FROM archived_posts WHERE linkedin_id = ?)""",
+                (target_id, linkedin_id, author, text_hash,
+                 bodies.preview(text), len(text), url, len(media_urls), posted_at,
+                 scraped_at, linkedin_id),
             )
-            self.conn.commit()
-            return True
         except sqlite3.IntegrityError:
             return False
+        inserted = cur.rowcount == 1
+        if inserted and text_hash is not None:
+            self._store_body(text, text_hash)
+        if inserted and media_urls:
+            self._insert_media(cur.lastrowid, media_urls)
+        if inserted:
+            self._count_terms(text)
+        if commit:
+            self.conn.commit()
+        return inserted
+
+    def iter_posts(self) -> Iterator[dict]:
+        """Stream every hot post with its target_url and media_urls.
+
+        Posts and their media are read by two cursors walked in post-id order,
+        so memory stays constant however large the table is.
+        """
+        posts = self.conn.execute(
+            f"""SELECT p.id, p.linkedin_id, p.author, p.preview, b.codec, b.body,
+                      {_POST_URL.format(row="p")} AS url, p.posted_at, p.scraped_at, t.url as target_url
+               FROM posts p JOIN targets t ON p.target_id = t.id
+               LEFT JOIN post_bodies b ON b.hash = p.text_hash
+               ORDER BY p.id"""
+        )
+        media = self.conn.execute(
+            """SELECT pm.post_id, m.url FROM post_media pm
+               JOIN media m ON m.hash = pm.media_hash
+               ORDER BY pm.post_id, pm.position"""
+        )
+        pending = media.fetchone()
+        for row in posts:
+            d = dict(row)
+            post_id = d.pop("id")
+            d["text"] = self._decode_body(d.pop("codec"), d.pop("body"), d.pop("preview"))
+            d["media_urls"] = []
+            while pending is not None and pending[0] <= post_id:
+                if pending[0] == post_id:
+                    d["media_urls"].append(pending[1])
+                pending = media.fetchone()
+            yield d
 
-    def get_new_posts(self, since_days: int = 7) -> list[dict]:
-        cutoff = datetime.now() - timedelta(days=since_days)
+    def _archived_index(self, since: str | None = None) -> dict[str, int]:
+        """Map linkedin_id to target_id for archived posts scraped after since.
+
+        Partition files are append-only and keep the records of removed
+        targets, whose ids SQLite may hand to a later target. The index rows
+        cascade away with their target, so only records still indexed are
+        live, and the index's target_id is the one to trust.
+        """
+        if since is None:
+            rows = self.conn.execute("SELECT linkedin_id, target_id FROM archived_posts")
+        else:
+            rows = self.conn.execute(
+                "SELECT linkedin_id, target_id FROM archived_posts WHERE scraped_at > ?", (since,)
+            )
+        return {row[0]: row[1] for row in rows}
+
+    def iter_archived(self) -> Iterator[dict]:
+        """Stream every archived post record with its target_url."""
+        target_urls = {t["id"]: t["url"] for t in self.list_targets()}
+        index = self._archived_index()
+        for record in archive.iter_archived(self.archive_dir):
+            record.pop("target_id")
+            target_url = target_urls.get(index.get(record["linkedin_id"]))
+            if target_url is not None:
+                record["target_url"] = target_url
+                yield record
+
+    @_retry_on_busy
+    def add_archived(self, records: list[dict], commit: bool = True) -> dict[str, int]:
+        """Append already-archived records to partitions and the archive index.
+
+        Each record needs a target_id. Returns records written per partition.
+        """
+        partitions = archive.append_posts(self.archive_dir, records)
+        self._index_archived(records)
+        if commit:
+            self.conn.commit()
+        return partitions
+
+    def _index_archived(self, records: list[dict]) -> None:
+        self.conn.executemany(
+            """INSERT OR REPLACE INTO archived_posts
+               (linkedin_id, target_id, partition, scraped_at) VALUES (?, ?, ?, ?)""",
+            [(r["linkedin_id"], r["target_id"], archive.partition_for(r["scraped_at"]),
+              r["scraped_at"]) for r in records],
+        )
+
+    def _media_urls(self, where: str, params: tuple) -> dict[int, list[str]]:
+        """Fetch media URLs, in stored order, for every post matching where."""
+        # media_count lets posts without media skip the post_media probe.
         cur = self.conn.execute(
-            """SELECT p.id, p.linkedin_id, p.author, p.text, p.url,
-                      p.media_urls, p.posted_at, p.scraped_at,
+            f"""SELECT pm.post_id, m.url
+                FROM posts p
+                JOIN post_media pm ON pm.post_id = p.id
+                JOIN media m ON m.hash = pm.media_hash
+                WHERE ({where}) AND p.media_count > 0
+                ORDER BY pm.post_id, pm.position""",
+            params,
+        )
+        media: dict[int, list[str]] = {}
+        for post_id, url in cur:
+            media.setdefault(post_id, []).append(url)
+        return media
+
+    @staticmethod
+    def _decode_body(codec: str | None, blob: bytes | None, preview: str | None) -> str:
+        if codec is None:
+            return preview or ""
+        return (preview or "") + bodies.decode(codec, blob)
+
+    def _hot_posts(self, where: str, params: tuple, include_media: bool = True,
+                   include_text: bool = True) -> list[dict]:
+        body_columns, body_join = "", ""
+        if include_text:
+            body_columns = ", b.codec, b.body"
+            body_join = "LEFT JOIN post_bodies b ON b.hash = p.text_hash"
+        # Plain tuples zipped with the column names build dicts faster than
+        # sqlite3.Row does, which matters on a full week of posts.
+        cur = self.conn.cursor()
+        cur.row_factory = None
+        cur.execute(
+            f"""SELECT p.id, p.linkedin_id, p.author,
+                      p.preview, p.text_length, {_POST_URL.format(row="p")} AS url,
+                      p.media_count, p.posted_at, p.scraped_at,
                       t.name as target_name, t.type as target_type, t.url as target_url
+                      {body_columns}
                FROM posts p
                JOIN targets t ON p.target_id = t.id
-               WHERE p.scraped_at > ?
+               {body_join}
+               WHERE {where}
                ORDER BY p.posted_at DESC""",
-            (cutoff.isoformat(),),
+            params,
         )
+        names = [column[0] for column in cur.description]
+        if include_text:
+            names = names[:-2]
+            decode = self._decode_body
+            results = []
+            for row in cur:
+                d = dict(zip(names, row))
+                d["text"] = decode(row[-2], row[-1], row[3])
+                results.append(d)
+        else:
+            results = [dict(zip(names, row)) for row in cur]
+        if include_media:
+            media = self._media_urls(where, params)
+            for d in results:
+                d["media_urls"] = media.get(d["id"], [])
+        return results
+
+    def _archived_posts(self, since: str | None, match=None, include_media: bool = True,
+                        include_text: bool = True) -> list[dict]:
+        """Read archived posts scraped after since (None for all history).
+
+        Partitions are only opened when the archive index holds posts newer
+        than since, so recent-window queries never leave the hot database.
+        Only records still in the archive index are returned, so posts of
+        removed targets stay hidden, matching the JOIN on the hot side.
+        """
+        index = self._archived_index(since)
+        if not index:
+            return []
+        targets = {t["id"]: t for t in self.list_targets()}
         results = []
-        for row in cur.fetchall():
+        for record in archive.iter_archived(self.archive_dir, since):
+            record.pop("target_id")
+            target = targets.get(index.get(record["linkedin_id"]))
+            if target is None or (match is not None and not match(record)):
+                continue
+            results.append(self._archived_record(record, target, include_media, include_text))
+        return results
+
+    @staticmethod
+    def _archived_record(record: dict, target: dict, include_media: bool = True,
+                         include_text: bool = True) -> dict:
+        record["media_count"] = len(record["media_urls"])
+        if not include_media:
+            del record["media_urls"]
+        text = record.get("text") or ""
+        record["preview"] = bodies.preview(text)
+        record["text_length"] = len(text)
+        if not include_text:
+            del record["text"]
+        record.update(
+            id=None,
+            target_name=target["name"],
+            target_type=target["type"],
+            target_url=target["url"],
+        )
+        return record
+
+    @staticmethod
+    def _merge(hot: list[dict], archived: list[dict]) -> list[dict]:
+        if not archived:
+            return hot
+        merged = hot + archived
+        merged.sort(key=lambda d: d["posted_at"] or "", reverse=True)
+        return merged
+
+    def get_new_posts(self, since_days: int = 7, include_media: bool = True,
+                      since_last_newsletter: bool = False,
+                      include_text: bool = True) -> list[dict]:
+        """Posts scraped in the last since_days days, newest posted first.
+
+        With since_last_newsletter=True, since_days is ignored and exactly the
+        posts not yet included in any recorded newsletter are returned.
+        Every post carries media_count, preview and text_length; media_urls
+        and the full text are only fetched when include_media and
+        include_text are true.
+        """
+        if since_last_newsletter:
+            return self._hot_posts(
+                """p.id >= ? AND NOT EXISTS
+                       (SELECT 1 FROM newsletter_posts np WHERE np.post_id = p.id)""",
+                (self._unpublished_from(),),
+                include_media,
+                include_text,
+            )
+        cutoff = (datetime.now() - timedelta(days=since_days)).isoformat()
+        return self._merge(
+            self._hot_posts("p.scraped_at > ?", (cutoff,), include_media, include_text),
+            self._archived_posts(cutoff, include_media=include_media, include_text=include_text),
+        )
+
+    def search_posts(self, query: str, since_days: int | None = None) -> list[dict]:
+        """Case-insensitive substring search over post text and author.
+
+        With since_days=None the whole history is searched, archives included.
+        """
+        # Bodies are compressed, so matching happens after decoding on both
+        # the hot and the archive side.
+        where, params, cutoff = "1", (), None
+        if since_days is not None:
+            cutoff = (datetime.now() - timedelta(days=since_days)).isoformat()
+            where, params = "p.scraped_at > ?", (cutoff,)
+        needle = query.lower()
+
+        def match(post: dict) -> bool:
+            return needle in (post["text"] or "").lower() or needle in (post["author"] or "").lower()
+
+        return self._merge(
+            [p for p in self._hot_posts(where, params) if match(p)],
+            self._archived_posts(cutoff, match=match),
+        )
+
+    def get_post(self, linkedin_id: str) -> dict | None:
+        """Look up one post by linkedin_id, reading its archive partition if needed."""
+        hot = self._hot_posts("p.linkedin_id = ?", (linkedin_id,))
+        if hot:
+            return hot[0]
+        row = self.conn.execute(
+            """SELECT a.partition, t.id, t.name, t.type, t.url
+               FROM archived_posts a JOIN targets t ON a.target_id = t.id
+               WHERE a.linkedin_id = ?""",
+            (linkedin_id,),
+        ).fetchone()
+        if not row or not (self.archive_dir / row["partition"]).exists():
+            return None
+        for record in archive.iter_partition(self.archive_dir / row["partition"]):
+            if record["linkedin_id"] == linkedin_id:
+                record.pop("target_id")
+                return self._archived_record(record, dict(row))
+        return None
+
+    @_retry_on_busy
+    def archive_posts(self, older_than_days: int = DEFAULT_RETENTION_DAYS) -> dict:
+        """Move posts scraped more than older_than_days ago into archive partitions.
+
+        Records are appended to the monthly gzipped NDJSON files first, then
+        indexed in archived_posts and removed from posts in one transaction,
+        and finally the freed pages are returned to the filesystem with an
+        incremental vacuum, which unlike VACUUM does not rewrite the file.
+        """
+        cutoff = (datetime.now() - timedelta(days=older_than_days)).isoformat()
+        rows = self.conn.execute(
+            f"""SELECT p.id, p.linkedin_id, p.target_id, p.author, p.text_hash,
+                      p.preview, b.codec, b.body, {_POST_URL.format(row="p")} AS url,
+                      p.posted_at, p.scraped_at
+               FROM posts p LEFT JOIN post_bodies b ON b.hash = p.text_hash
+               WHERE p.scraped_at < ? ORDER BY p.scraped_at""",
+            (cutoff,),
+        ).fetchall()
+        if not rows:
+            return {"archived": 0, "partitions": {}}
+        media = self._media_urls("p.scraped_at < ?", (cutoff,))
+        records = []
+        hashes: set[bytes] = set()
+        for row in rows:
+            d = dict(row)
+            if d["text_hash"] is not None:
+                hashes.add(d["text_hash"])
+            del d["text_hash"]
+            d["text"] = self._decode_body(d.pop("codec"), d.pop("body"), d.pop("preview"))
+            d["media_urls"] = media.get(d.pop("id"), [])
+            records.append(d)
+        partitions = archive.append_posts(self.archive_dir, records)
+        with self.conn:
+            self._index_archived(records)
+            self.conn.executemany(
+                "DELETE FROM posts WHERE linkedin_id = ?",
+                [(r["linkedin_id"],) for r in records],
+            )
+            self._delete_orphan_bodies(hashes)
+        self.conn.execute("PRAGMA incremental_vacuum").fetchall()
+        return {"archived": len(records), "partitions": partitions}
+
+    @_retry_on_busy
+    def record_newsletter(self, file_path: str, post_count: int,
+                          created_at: str | None = None,
+                          linkedin_ids: list[str] | None = None,
+                          commit: bool = True) -> int:
+        """Record a generated newsletter and the posts it published.
+
+        linkedin_ids are the posts included in the issue; they fill
+        newsletter_posts so since_last_newsletter never repeats them.
+        Returns the newsletter id.
+        """
+        start = self._unpublished_from()
+        # Re-importing an export must not duplicate history, so a newsletter
+        # with the same file and timestamp is recorded only once.
+        existing = None
+        if created_at is not None:
+            existing = self.conn.execute(
+                "SELECT id FROM newsletters WHERE file_path = ? AND created_at = ?",
+                (file_path, created_at),
+            ).fetchone()
+        if existing:
+            newsletter_id = existing["id"]
+        else:
+            newsletter_id = self.conn.execute(
+                """INSERT INTO newsletters (file_path, post_count, created_at)
+                   VALUES (?, ?, COALESCE(?, CURRENT_TIMESTAMP))""",
+                (file_path, post_count, created_at),
+            ).lastrowid
+        if linkedin_ids:
+            self.conn.executemany(
+                """INSERT OR IGNORE INTO newsletter_posts (post_id, newsletter_id)
+                   SELECT id, ? FROM posts WHERE linkedin_id = ?""",
+                [(newsletter_id, lid) for lid in linkedin_ids],
+            )
+        self._advance_watermark(newsletter_id, start)
+        if commit:
+            self.conn.commit()
+        return newsletter_id
+
+    def _unpublished_from(self) -> int:
+        """Lowest post id that can still be unpublished.
+
+        Every post below the latest newsletter's watermark has been
+        published, so since_last_newsletter only range-scans ids above it.
+        SQLite reuses the highest rowid after the newest posts are deleted,
+        so the bound never exceeds one past the highest published post.
+        """
+        row = self.conn.execute(
+            """SELECT (SELECT unpublished_from FROM newsletters ORDER BY id DESC LIMIT 1),
+                      (SELECT MAX(post_id) FROM newsletter_posts)"""
+        ).fetchone()
+        watermark, max_published = row
+        if watermark is None or max_published is None:
+            return 0
+        return min(watermark, max_published + 1)
+
+    def _advance_watermark(self, newsletter_id: int, start: int) -> None:
+        # Walks forward from the previous watermark to the first unpublished
+        # post, so over time each post is stepped over once.
+        row = self.conn.execute(
+            """SELECT MIN(p.id) FROM posts p
+               WHERE p.id >= ? AND NOT EXISTS
+                   (SELECT 1 FROM newsletter_posts np WHERE np.post_id = p.id)""",
+            (start,),
+        ).fetchone()
+        watermark = row[0]
+        if watermark is None:
+            watermark = self.conn.execute(
+                "SELECT COALESCE(MAX(id), 0) + 1 FROM posts"
+            ).fetchone()[0]
+        self.conn.execute(
+            "UPDATE newsletters SET unpublished_from = ? WHERE id = ?",
+            (watermark, newsletter_id),
+        )
+
+    def iter_newsletters(self) -> Iterator[dict]:
+        """Stream newsletter records, each with the linkedin_ids it published."""
+        cur = self.conn.execute(
+            """SELECT n.id, n.file_path, n.post_count, n.created_at,
+                      (SELECT json_group_array(p.linkedin_id)
+                       FROM newsletter_posts np JOIN posts p ON p.id = np.post_id
+                       WHERE np.newsletter_id = n.id) AS linkedin_ids
+               FROM newsletters n ORDER BY n.id"""
+        )
+        for row in cur:
             d = dict(row)
-            d["media_urls"] = json.loads(d["media_urls"])
-            results.append(d)
+            d["linkedin_ids"] = json.loads(d["linkedin_ids"])
+            yield d
+
+    def get_target_stats(self, days: int = DEFAULT_STATS_DAYS) -> list[dict]:
+        """Per-target activity read from the materialized stats, busiest first.
+
+        posts_this_period counts posts from the last `days` days and
+        posts_previous_period the `days` before that; change is the
+        difference between them. Targets with no posts are included with
+        zero counts.
+        """
+        cur = self.conn.execute(
+            """SELECT t.id AS target_id, t.name AS target_name, t.type AS target_type,
+                      t.url AS target_url,
+                      COALESCE(s.post_count, 0) AS post_count,
+                      COALESCE(s.total_length, 0) AS total_length,
+                      COALESCE(s.media_posts, 0) AS media_posts,
+                      s.last_post_at,
+                      (SELECT COALESCE(SUM(d.post_count), 0) FROM target_daily_stats d
+                       WHERE d.target_id = t.id AND d.day > date('now', ?))
+                          AS posts_this_period,
+                      (SELECT COALESCE(SUM(d.post_count), 0) FROM target_daily_stats d
+                       WHERE d.target_id = t.id AND d.day > date('now', ?)
+                         AND d.day <= date('now', ?))
+                          AS posts_previous_period
+               FROM targets t LEFT JOIN target_stats s ON s.target_id = t.id
+               ORDER BY posts_this_period DESC, post_count DESC, t.name""",
+            (f"-{days} days", f"-{2 * days} days", f"-{days} days"),
+        )
+        results = []
+        for row in cur.fetchall():
+            stats = dict(row)
+            count = stats["post_count"]
+            total_length = stats.pop("total_length")
+            media_posts = stats.pop("media_posts")
+            stats["avg_length"] = round(total_length / count, 1) if count else 0.0
+            stats["media_ratio"] = round(media_posts / count, 3) if count else 0.0
+            stats["posts_per_day"] = round(stats["posts_this_period"] / days, 2)
+            stats["change"] = stats["posts_this_period"] - stats["posts_previous_period"]
+            results.append(stats)
         return results
 
-    def record_newsletter(self, file_path: str, post_count: int) -> None:
+    def term_df(self, terms: set[str]) -> tuple[dict[str, int], int]:
+        """Document frequencies of terms and the number of documents counted.
+
+        Every post ever inserted counts once; archiving or removing posts
+        does not lower the figures, which only feed IDF weights.
+        """
+        terms = sorted(terms)
+        df: dict[str, int] = {}
+        for start in range(0, len(terms), 500):
+            chunk = terms[start:start + 500]
+            rows = self.conn.execute(
+                f"SELECT term, df FROM term_df WHERE term IN ({','.join('?' * len(chunk))})",
+                chunk,
+            )
+            df.update((row["term"], row["df"]) for row in rows)
+        row = self.conn.execute("SELECT documents FROM term_corpus WHERE id = 1").fetchone()
+        return df, row["documents"] if row else 0
+
+    def get_topic_clusters(self, since_days: int = 7, since_last_newsletter: bool = False,
+                           threshold: float = topics.DEFAULT_THRESHOLD) -> list[dict]:
+        """Cluster the posts get_new_posts would return into topics.
+
+        See topics.cluster_posts for the shape of each topic.
+        """
+        posts = self.get_new_posts(since_days=since_days, include_media=False,
+                                   since_last_newsletter=since_last_newsletter)
+        terms = set().union(*(topics.document_terms(p["text"] or "") for p in posts))
+        df, documents = self.term_df(terms)
+        return topics.cluster_posts(posts, df, documents, threshold=threshold)
+
+    def get_import_progress(self, source: str) -> dict | None:
+        row = self.conn.execute(
+            "SELECT byte_offset, records FROM import_progress WHERE source = ?", (source,)
+        ).fetchone()
+        return dict(row) if row else None
+
+    @_retry_on_busy
+    def set_import_progress(self, source: str, byte_offset: int, records: int,
+                            commit: bool = True) -> None:
         self.conn.execute(
-            "INSERT INTO newsletters (file_path, post_count) VALUES (?, ?)",
-            (file_path, post_count),
+            """INSERT OR REPLACE INTO import_progress (source, byte_offset, records, updated_at)
+               VALUES (?, ?, ?, CURRENT_TIMESTAMP)""",
+            (source, byte_offset, records),
         )
+        if commit:
+            self.conn.commit()
+
+    @_retry_on_busy
+    def clear_import_progress(self, source: str, commit: bool = True) -> None:
+        self.conn.execute("DELETE FROM import_progress WHERE source = ?", (source,))
+        if commit:
+            self.conn.commit()
+
+    def integrity_problems(self) -> list[str]:
+        """Messages from PRAGMA integrity_check and foreign_key_check; empty if healthy."""
+        problems = [
+            row[0] for row in self.conn.execute("PRAGMA integrity_check")
+            if row[0] != "ok"
+        ]
+        problems.extend(
+            f"{row[0]} row {row[1]} references missing {row[2]}"
+            for row in self.conn.execute("PRAGMA foreign_key_check")
+        )
+        return problems
+
+    def find_orphans(self) -> dict[str, int]:
+        """Count rows nothing refers to, or that refer to something gone.
+
+        bodies and media are unreferenced and safe to delete; the others
+        point at a missing target or archive partition and are only reported.
+        """
+        partitions = {p.name for p in archive.list_partitions(self.archive_dir)}
+        indexed = self.conn.execute(
+            "SELECT partition, COUNT(*) FROM archived_posts GROUP BY partition"
+        ).fetchall()
+        return {
+            "bodies": self.conn.execute(
+                """SELECT COUNT(*) FROM post_bodies b WHERE NOT EXISTS
+                       (SELECT 1 FROM posts p WHERE p.text_hash = b.hash)"""
+            ).fetchone()[0],
+            "media": self.conn.execute(
+                "SELECT COUNT(*) FROM media WHERE hash NOT IN (SELECT media_hash FROM post_media)"
+            ).fetchone()[0],
+            "posts_without_target": self.conn.execute(
+                """SELECT COUNT(*) FROM posts WHERE target_id IS NULL
+                       OR target_id NOT IN (SELECT id FROM targets)"""
+            ).fetchone()[0],
+            "archived_without_partition": sum(
+                count for name, count in indexed if name not in partitions
+            ),
+        }
+
+    @_retry_on_busy
+    def delete_orphans(self) -> dict[str, int]:
+        """Delete unreferenced bodies and media, returning rows removed per table."""
+        with self.conn:
+            bodies_removed = self.conn.execute(
+                """DELETE FROM post_bodies WHERE NOT EXISTS
+                       (SELECT 1 FROM posts p WHERE p.text_hash = post_bodies.hash)"""
+            ).rowcount
+            media_removed = self.conn.execute(
+                "DELETE FROM media WHERE hash NOT IN (SELECT media_hash FROM post_media)"
+            ).rowcount
+        return {"bodies": bodies_removed, "media": media_removed}
+
+    @_retry_on_busy
+    def optimize(self) -> None:
+        """Refresh query-planner statistics."""
+        self.conn.execute("ANALYZE")
+        self.conn.execute("PRAGMA optimize")
+        self.conn.commit()
+
+    def storage_bytes(self) -> int:
+        """Size of the database file plus its WAL."""
+        wal = self.db_path.with_name(self.db_path.name + "-wal")
+        return self.db_path.stat().st_size + (wal.stat().st_size if wal.exists() else 0)
+
+    @_retry_on_busy
+    def incremental_vacuum(self) -> dict[str, int]:
+        """Return free pages to the filesystem and truncate the WAL.
+
+        Returns the free page count before and after and the bytes reclaimed.
+        """
+        self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchall()
+        before = self.storage_bytes()
+        free_before = self.conn.execute("PRAGMA freelist_count").fetchone()[0]
+        # Each step of the pragma frees one page, so it has to be drained.
+        self.conn.execute("PRAGMA incremental_vacuum").fetchall()
         self.conn.commit()
+        self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchall()
+        after = self.storage_bytes()
+        return {
+            "free_pages_before": free_before,
+            "free_pages_after": self.conn.execute("PRAGMA freelist_count").fetchone()[0],
+            "bytes_before": before,
+            "bytes_after": after,
+            "reclaimed_bytes": before - after,
+        }
 
     def close(self):
         self.conn.close()
@@ -0,0 +1,169 @@
+# src/ai4news/topics.py
+"""Local topic clustering over sparse TF-IDF vectors.
+
+Document frequencies come from the store (Database.term_df), which keeps
+them current on every insert, so clustering a week of posts never has to
+re-read the corpus. Pairwise similarities are computed with NumPy when it
+is installed and with a sparse inverted index otherwise; both paths feed
+the same clustering step and give the same groups.
+"""
+import math
+import re
+from collections import Counter
+
+try:
+    import numpy as np
+except ImportError:  # optional: the pure-Python path handles small weeks fine
+    np = None
+
+DEFAULT_THRESHOLD = 0.25
+LABEL_TERMS = 3
+MIN_TERM_LENGTH = 3
+
+_WORD = re.compile(r"[^\W_][\w+#.-]*[\w+#]|[^\W_]", re.UNICODE)
+
+STOPWORDS = frozenset("""
+    about above after again against all also am an and any are aren't as at be
+    because been before being below between both but by can could did do does
+    doing down during each few for from further get got had has have having he
+    her here hers herself him himself his how i if in into is it its itself
+    just let like me more most my myself new no nor not now of off on once
+    only or other our ours ourselves out over own same she should so some such
+    than that the their theirs them themselves then there these they this
+    those through to too under until up very was we were what when where which
+    while who whom why will with would you your yours yourself yourselves
+    today week weeks year years day days one two first last next really many
+    much every still well make made way great excited proud happy share
+    sharing thank thanks team https http www com linkedin
+""".split())
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercased terms of text, without stopwords or very short words."""
+    return [
+        w for w in _WORD.findall(text.lower())
+        if len(w) >= MIN_TERM_LENGTH and w not in STOPWORDS and not w.isdigit()
+    ]
+
+
+def document_terms(text: str) -> set[str]:
+    """The distinct terms of one document, as counted in document frequencies."""
+    return set(tokenize(text))
+
+
+def _idf(df: int, documents: int) -> float:
+    # Smoothed so terms never seen by the store (df=0) still get a finite
+    # weight, and terms in every document keep a small positive one.
+    return math.log((1 + documents) / (1 + df)) + 1.0
+
+
+def tfidf_vectors(texts: list[str], df: dict[str, int], documents: int) -> list[dict[str, float]]:
+    """L2-normalized sparse TF-IDF vectors with sublinear term frequency."""
+    vectors = []
+    for text in texts:
+        counts = Counter(tokenize(text))
+        vec = {t: (1.0 + math.log(c)) * _idf(df.get(t, 0), documents) for t, c in counts.items()}
+        norm = math.sqrt(sum(w * w for w in vec.values()))
+        vectors.append({t: w / norm for t, w in vec.items()} if norm else {})
+    return vectors
+
+
+def _postings(vectors: list[dict[str, float]]) -> dict[str, list[tuple[int, float]]]:
+    postings: dict[str, list[tuple[int, float]]] = {}
+    for i, vec in enumerate(vectors):
+        for term, w in vec.items():
+            postings.setdefault(term, []).append((i, w))
+    return postings
+
+
+def _similarities_sparse(vectors: list[dict[str, float]]) -> list[list[float]]:
+    n = len(vectors)
+    sims = [[0.0] * n for _ in range(n)]
+    # Only documents sharing a term contribute, so cost follows overlap
+    # rather than n squared.
+    for entries in _postings(vectors).values():
+        for a, (i, wi) in enumerate(entries):
+            for j, wj in entries[a + 1:]:
+                sims[i][j] += wi * wj
+    for i in range(n):
+        sims[i][i] = 1.0 if vectors[i] else 0.0
+        for j in range(i + 1, n):
+            sims[j][i] = sims[i][j]
+    return sims
+
+
+def _similarities_numpy(vectors: list[dict[str, float]]) -> list[list[float]]:
+    n = len(vectors)
+    sims = np.zeros((n, n))
+    # Accumulated term by term from the postings, like the sparse path, so
+    # memory follows the non-zero weights instead of posts times vocabulary.
+    # Terms in a single post add nothing off the diagonal and are skipped.
+    for entries in _postings(vectors).values():
+        if len(entries) < 2:
+            continue
+        docs = np.fromiter((i for i, _ in entries), dtype=np.intp, count=len(entries))
+        weights = np.fromiter((w for _, w in entries), dtype=float, count=len(entries))
+        sims[np.ix_(docs, docs)] += np.outer(weights, weights)
+    np.fill_diagonal(sims, [1.0 if vec else 0.0 for vec in vectors])
+    return sims.tolist()
+
+
+def similarities(vectors: list[dict[str, float]]) -> list[list[float]]:
+    """Pairwise cosine similarities of normalized sparse vectors."""
+    if np is not None and vectors:
+        return _similarities_numpy(vectors)
+    return _similarities_sparse(vectors)
+
+
+def _label(members: list[int], vectors: list[dict[str, float]]) -> list[str]:
+    weights: Counter = Counter()
+    for i in members:
+        weights.update(vectors[i])
+    return [t for t, _ in sorted(weights.items(), key=lambda kv: (-kv[1], kv[0]))[:LABEL_TERMS]]
+
+
+def cluster_posts(
+    posts: list[dict],
+    df: dict[str, int],
+    documents: int,
+    threshold: float = DEFAULT_THRESHOLD,
+) -> list[dict]:
+    """Group posts about the same story, largest topic first.
+
+    Posts are taken in order and join the topic whose members they are most
+    similar to on average, provided that average reaches threshold;
+    otherwise they start a new topic. Each topic has its member posts, a
+    representative (the member closest to the rest, longest text on ties)
+    and a label built from its highest-weighted terms. Posts need a text
+    or preview.
+    """
+    texts = [p.get("text") or p.get("preview") or "" for p in posts]
+    vectors = tfidf_vectors(texts, df, documents)
+    sims = similarities(vectors)
+
+    clusters: list[list[int]] = []
+    for i in range(len(posts)):
+        best, best_score = None, 0.0
+        for c, members in enumerate(clusters):
+            score = sum(sims[i][j] for j in members) / len(members)
+            if best is None or score > best_score:
+                best, best_score = c, score
+        if best is None or best_score < threshold:
+            clusters.append([i])
+        else:
+            clusters[best].append(i)
+
+    topics = []
+    for members in clusters:
+        rep = max(members, key=lambda i: (sum(sims[i][j] for j in members), len(texts[i]), -i))
+        terms = _label(members, vectors)
+        topics.append({
+            "label": ", ".join(terms),
+            "terms": terms,
+            "representative": posts[rep],
+            "posts": [posts[i] for i in members],
+        })
+    topics.sort(key=lambda t: len(t["posts"]), reverse=True)
+    for n, topic in enumerate(topics, 1):
+        topic["topic_id"] = n
+    return topics
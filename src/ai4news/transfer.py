@@ -0,0 +1,184 @@
+# src/ai4news/transfer.py
+import argparse
+import gzip
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import BinaryIO
+
+from ai4news.config import get_data_dir
+from ai4news.storage import SCHEMA_VERSION, Database
+
+EXPORT_FORMAT = "ai4news-ndjson"
+EXPORT_VERSION = 1
+DEFAULT_BATCH_SIZE = 5000
+
+
+def _open(path: Path, mode: str) -> BinaryIO:
+    if path.suffix == ".gz":
+        return gzip.open(path, mode)
+    return open(path, mode)
+
+
+def _write(out: BinaryIO, kind: str, record: dict) -> None:
+    out.write(json.dumps({"kind": kind, **record}, ensure_ascii=False).encode("utf-8"))
+    out.write(b"\n")
+
+
+def export_store(db: Database, out: BinaryIO) -> dict:
+    """Stream the whole store to out as NDJSON, one record per line.
+
+    Records are written in dependency order -- header, targets, posts,
+    archived posts, newsletters -- and refer to targets by URL so they can be
+    loaded into a database with different row ids. Every table is read
+    through a cursor, so memory use does not grow with the store, and all of
+    them inside one read transaction, so the file is a consistent snapshot
+    even while other processes keep writing.
+    Returns the number of records written per kind.
+    """
+    db.conn.execute("BEGIN DEFERRED")
+    try:
+        return _export_records(db, out)
+    finally:
+        db.conn.commit()
+
+
+def _export_records(db: Database, out: BinaryIO) -> dict:
+    counts = {"target": 0, "post": 0, "archived_post": 0, "newsletter": 0}
+    _write(out, "header", {
+        "format": EXPORT_FORMAT,
+        "version": EXPORT_VERSION,
+        "schema_version": SCHEMA_VERSION,
+        "exported_at": datetime.now().isoformat(timespec="seconds"),
+    })
+    for target in db.list_targets():
+        target.pop("id")
+        _write(out, "target", target)
+        counts["target"] += 1
+    for post in db.iter_posts():
+        _write(out, "post", post)
+        counts["post"] += 1
+    for record in db.iter_archived():
+        _write(out, "archived_post", record)
+        counts["archived_post"] += 1
+    for newsletter in db.iter_newsletters():
+        newsletter.pop("id")
+        _write(out, "newsletter", newsletter)
+        counts["newsletter"] += 1
+    return counts
+
+
+def import_store(db: Database, path: Path, batch_size: int = DEFAULT_BATCH_SIZE,
+                 restart: bool = False) -> dict:
+    """Load an export_store file into db in batched transactions.
+
+    After every batch the byte offset reached in the file is committed to
+    import_progress in the same transaction as the batch's rows, so an
+    interrupted import resumes exactly where it stopped when run again.
+    The last batch clears the saved progress instead, so importing the same
+    file again later starts from the top. Pass restart=True to ignore saved
+    progress. Duplicate posts are skipped
+    as they are on ingest.
+    Returns counts of records read, posts added, skipped records and errors.
+    """
+    source = str(path.resolve())
+    if restart:
+        db.clear_import_progress(source)
+    progress = db.get_import_progress(source) or {"byte_offset": 0, "records": 0}
+    result = {
+        "resumed_at": progress["records"],
+        "records": progress["records"],
+        "new_posts": 0,
+        "skipped": 0,
+        "errors": [],
+    }
+    target_ids = {t["url"]: t["id"] for t in db.list_targets()}
+    archived: list[dict] = []
+    pending = 0
+
+    def flush(offset: int, done: bool = False) -> None:
+        nonlocal pending
+        if archived:
+            db.add_archived(archived, commit=False)
+            archived.clear()
+        if done:
+            db.clear_import_progress(source, commit=False)
+        else:
+            db.set_import_progress(source, offset, result["records"], commit=False)
+        db.conn.commit()
+        pending = 0
+
+    with _open(path, "rb") as f:
+        f.seek(progress["byte_offset"])
+        while line := f.readline():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            kind = record.pop("kind")
+            result["records"] += 1
+            pending += 1
+            if kind == "header":
+                if record.get("format") != EXPORT_FORMAT:
+                    raise ValueError(f"Not an ai4news export: {path}")
+            elif kind == "target":
+                target_ids[record["url"]] = db.upsert_target(
+                    url=record["url"], target_type=record["type"],
+                    name=record.get("name") or "", commit=False,
+                )
+            elif kind in ("post", "archived_post"):
+                target_id = target_ids.get(record.pop("target_url"))
+                if target_id is None:
+                    result["errors"].append(f"Unknown target for {record['linkedin_id']}")
+                elif kind == "archived_post":
+                    archived.append({**record, "target_id": target_id})
+                elif db.insert_post(target_id=target_id, commit=False, **record):
+                    result["new_posts"] += 1
+                else:
+                    result["skipped"] += 1
+            elif kind == "newsletter":
+                db.record_newsletter(commit=False, **record)
+            else:
+                result["errors"].append(f"Unknown record kind: {kind}")
+            if pending >= batch_size:
+                flush(f.tell())
+        flush(f.tell(), done=True)
+    return result
+
+
+def export_main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="ai4news-export", description="Export the ai4news store as NDJSON."
+    )
+    parser.add_argument("output", help="output file ('.gz' to compress) or '-' for stdout")
+    parser.add_argument("--db", type=Path, default=None, help="database path (default: data/ai4news.db)")
+    args = parser.parse_args(argv)
+    db = Database(args.db or get_data_dir() / "ai4news.db")
+    try:
+        if args.output == "-":
+            counts = export_store(db, sys.stdout.buffer)
+        else:
+            with _open(Path(args.output), "wb") as out:
+                counts = export_store(db, out)
+    finally:
+        db.close()
+    print(json.dumps(counts), file=sys.stderr)
+    return 0
+
+
+def import_main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="ai4news-import", description="Import an ai4news NDJSON export."
+    )
+    parser.add_argument("input", type=Path, help="file written by ai4news-export")
+    parser.add_argument("--db", type=Path, default=None, help="database path (default: data/ai4news.db)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--restart", action="store_true", help="ignore saved progress")
+    args = parser.parse_args(argv)
+    db = Database(args.db or get_data_dir() / "ai4news.db")
+    try:
+        result = import_store(db, args.input, args.batch_size, args.restart)
+    finally:
+        db.close()
+    print(json.dumps(result))
+    return 1 if result["errors"] else 0
@@ -0,0 +1,41 @@
+# tests/test_archive.py
+import gzip
+
+from ai4news.archive import append_posts, iter_archived, list_partitions, partition_for
+
+
+def _record(linkedin_id: str, scraped_at: str) -> dict:
+    return {
+        "linkedin_id": linkedin_id,
+        "target_id": 1,
+        "author": "Test",
+        "text": "Archived text",
+        "url": "",
+        "media_urls": [],
+        "posted_at": scraped_at,
+        "scraped_at": scraped_at,
+    }
+
+
+def test_partition_for_is_monthly():
+    assert partition_for("2025-03-14 10:00:00") == "posts-2025-03.ndjson.gz"
+
+
+def test_append_posts_is_append_only(tmp_path):
+    append_posts(tmp_path, [_record("a", "2025-03-01 00:00:00")])
+    written = append_posts(tmp_path, [
+        _record("b", "2025-03-02 00:00:00"),
+        _record("c", "2025-04-01 00:00:00"),
+    ])
+    assert written == {"posts-2025-03.ndjson.gz": 1, "posts-2025-04.ndjson.gz": 1}
+    with gzip.open(tmp_path / "posts-2025-03.ndjson.gz", "rt") as f:
+        assert len(f.readlines()) == 2
+    assert [r["linkedin_id"] for r in iter_archived(tmp_path)] == ["a", "b", "c"]
+
+
+def test_iter_archived_skips_old_partitions_and_repeats(tmp_path):
+    append_posts(tmp_path, [_record("a", "2025-03-01 00:00:00")])
+    append_posts(tmp_path, [_record("b", "2025-04-05 00:00:00")])
+    append_posts(tmp_path, [_record("b", "2025-04-05 00:00:00")])
+    assert len(list_partitions(tmp_path, since="2025-04-01")) == 1
+    assert [r["linkedin_id"] for r in iter_archived(tmp_path, since="2025-04-01")] == ["b"]
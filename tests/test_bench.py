@@ -0,0 +1,132 @@
+# tests/test_bench.py
+"""Tests for the synthetic corpus generator and benchmark runner."""
+import urllib.request
+
+import pytest
+
+from ai4news.bench.corpus import iter_posts, make_targets
+from ai4news.bench.e2e import extract_posts, run_e2e
+from ai4news.bench.fake_linkedin import FakeLinkedIn, render_page
+from ai4news.bench.runner import compare_to_baseline, run_scale
+from ai4news.bench.stress import run_stress
+from ai4news.storage import Database
+
+
+def test_corpus_is_seeded():
+    targets = make_targets(3, seed=1)
+    first = list(iter_posts(targets, 5, seed=1))
+    second = list(iter_posts(targets, 5, seed=1))
+    assert first == second
+    assert len(first) == 15
+    assert len({p["linkedin_id"] for _, p in first}) == 15
+
+
+def test_corpus_respects_options():
+    targets = make_targets(2)
+    posts = [p for _, p in iter_posts(
+        targets, 50, text_length=(10, 20), length_distribution="uniform",
+        media_max=2, media_probability=1.0, posted_at_formats=("date",),
+    )]
+    for p in posts:
+        assert 10 <= len(p["text"]) <= 20
+        assert 1 <= len(p["media_urls"]) <= 2
+        assert len(p["posted_at"]) == len("2026-02-14")
+
+
+def test_corpus_rejects_unknown_format():
+    with pytest.raises(ValueError):
+        list(iter_posts(make_targets(1), 1, posted_at_formats=("epoch",)))
+
+
+def test_run_scale_reports_every_scenario(tmp_path):
+    results = run_scale(40, tmp_path, num_targets=4, profile_memory=True)
+    assert results["posts"] == 40
+    for name in ("insert_post", "get_new_posts", "get_new_posts_counts_only", "get_new_posts_previews",
+                 "export_ndjson", "import_ndjson", "group_posts_by_target", "generate_html",
+                 "generate_html_split", "cluster_topics"):
+        assert results[name]["seconds"] >= 0
+        assert "peak_bytes" in results[name]
+    split = results["generate_html_split"]
+    assert split["index_gzip_bytes"] < split["index_bytes"] < results["generate_html"]["output_bytes"]
+
+
+def test_compare_to_baseline_flags_regressions():
+    baseline = {"results": {"1000": {"get_new_posts": {"seconds": 1.0, "peak_bytes": 10}}}}
+    ok = {"results": {"1000": {"get_new_posts": {"seconds": 1.1, "peak_bytes": 10}}}}
+    slow = {"results": {"1000": {"get_new_posts": {"seconds": 2.0, "peak_bytes": 10}}}}
+    other_scale = {"results": {"5": {"get_new_posts": {"seconds": 99.0}}}}
+    assert compare_to_baseline(ok, baseline) == []
+    assert compare_to_baseline(other_scale, baseline) == []
+    regressions = compare_to_baseline(slow, baseline)
+    assert len(regressions) == 1
+    assert "get_new_posts" in regressions[0]
+
+
+def test_compare_to_baseline_flags_size_growth():
+    baseline = {"results": {"1000": {"db_bytes": 1000,
+                                     "generate_html": {"seconds": 1.0, "output_bytes": 100}}}}
+    same = {"results": {"1000": {"db_bytes": 1040,
+                                 "generate_html": {"seconds": 1.0, "output_bytes": 104}}}}
+    larger = {"results": {"1000": {"db_bytes": 1200,
+                                   "generate_html": {"seconds": 1.0, "output_bytes": 120}}}}
+    assert compare_to_baseline(same, baseline) == []
+    regressions = compare_to_baseline(larger, baseline)
+    assert len(regressions) == 2
+    assert any("db_bytes" in r for r in regressions)
+    assert any("output_bytes" in r for r in regressions)
+
+
+def test_concurrent_writers_lose_nothing(tmp_path):
+    result = run_stress(tmp_path, processes=4, posts_per_process=50, targets_per_process=3)
+    assert result["failed_processes"] == 0
+    assert result["lost_posts"] == 0
+    assert result["lost_yaml_targets"] == 0
+    assert result["targets_in_db"] == 12
+    assert result["posts_per_second"] > 0
+
+
+def test_concurrent_first_opens_migrate_legacy_file_once(tmp_path):
+    result = run_stress(tmp_path, processes=4, posts_per_process=20, targets_per_process=2,
+                        legacy_posts=2000)
+    assert result["failed_processes"] == 0
+    assert result["lost_posts"] == 0
+    assert result["targets_in_db"] == 9
+    db = Database(tmp_path / "stress.db")
+    assert db.integrity_problems() == []
+    assert db.conn.execute("SELECT COUNT(*) FROM post_media").fetchone()[0] > 0
+    db.close()
+
+
+def _as_extracted(posts):
+    # The skill's extractor trims innerText.
+    return [dict(p, text=p["text"].strip()) for p in posts]
+
+
+def test_extractor_reads_fake_pages_like_the_skill():
+    posts = _as_extracted(p for _, p in iter_posts(make_targets(1), 5, text_length=(40, 400), seed=3))
+    assert extract_posts(render_page("Test", posts), limit=10) == posts
+    assert extract_posts(render_page("Test", posts)) == posts[:3]
+
+
+def test_fake_linkedin_serves_activity_pages_and_login_wall():
+    targets = make_targets(2)
+    with FakeLinkedIn(targets, posts_per_page=4) as fake:
+        url = fake.local_url(targets[0]["url"])
+        path = "/posts/" if targets[0]["type"] == "company" else "/recent-activity/all/"
+        with urllib.request.urlopen(url + path) as resp:
+            assert extract_posts(resp.read().decode("utf-8"), limit=10) == _as_extracted(fake.posts[targets[0]["url"]])
+    with FakeLinkedIn(targets, login_wall=True) as fake:
+        with urllib.request.urlopen(fake.local_url(targets[0]["url"]) + path) as resp:
+            page = resp.read().decode("utf-8")
+        assert "Sign in" in page
+        assert extract_posts(page) == []
+
+
+def test_e2e_pipeline_loses_nothing(tmp_path):
+    result = run_e2e(tmp_path, num_targets=6, posts_per_page=5, latency=0.0, concurrency=3)
+    assert result["errors"] == []
+    assert result["lost_posts"] == 0
+    assert result["posts_new"] == 18
+    assert result["requests"] == 6
+    assert result["targets_per_second"] > 0
+    assert (tmp_path / "newsletters").is_dir()
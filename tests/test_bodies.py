@@ -0,0 +1,29 @@
+# tests/test_bodies.py
+from ai4news.bodies import RAW, ZLIB, body_hash, decode, encode
+
+
+def test_round_trip_compressible_text():
+    text = "Agents, evaluation and safety research. " * 30
+    codec, blob = encode(text)
+    assert codec != RAW
+    assert len(blob) < len(text.encode("utf-8"))
+    assert decode(codec, blob) == text
+
+
+def test_short_text_is_stored_raw():
+    codec, blob = encode("Hiring!")
+    assert codec == RAW
+    assert decode(codec, blob) == "Hiring!"
+
+
+def test_zlib_fallback_and_unicode():
+    text = "这是一段中文内容。" * 40
+    codec, blob = encode(text, codec=ZLIB)
+    assert codec == ZLIB
+    assert decode(codec, blob) == text
+
+
+def test_body_hash_is_content_addressed():
+    assert body_hash("same") == body_hash("same")
+    assert body_hash("same") != body_hash("different")
+    assert len(body_hash("same")) == 16
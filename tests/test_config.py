@@ -2,7 +2,7 @@
 import tempfile
 from pathlib import Path
 
-from ai4news.config import load_targets, get_project_root, get_data_dir
+from ai4news.config import load_targets, get_project_root, get_data_dir, save_targets, targets_lock
 
 
 def test_get_project_root():
@@ -53,3 +53,20 @@ def test_load_targets_validates_type():
             assert False, "Should have raised ValueError"
         except ValueError as e:
             assert "invalid" in str(e).lower()
+
+
+def test_save_targets_is_atomic(tmp_path):
+    path = tmp_path / "targets.yaml"
+    save_targets([{"type": "person", "name": "A", "url": "https://x"}], path)
+    with targets_lock(path):
+        save_targets([], path)
+    assert load_targets(path) == []
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["targets.yaml", "targets.yaml.lock"]
+
+
+def test_save_targets_keeps_file_mode(tmp_path):
+    path = tmp_path / "targets.yaml"
+    path.write_text("targets: []\n")
+    path.chmod(0o664)
+    save_targets([{"type": "person", "name": "A", "url": "https://x"}], path)
+    assert path.stat().st_mode & 0o777 == 0o664
@@ -0,0 +1,52 @@
+# tests/test_maintenance.py
+import tempfile
+from pathlib import Path
+
+from ai4news.maintenance import main, maintain_db
+from ai4news.storage import Database
+
+
+def _populated_db(path: Path, posts: int = 300) -> Database:
+    db = Database(path)
+    tid = db.upsert_target(url="https://www.linkedin.com/in/test", target_type="person", name="Test")
+    for n in range(posts):
+        db.insert_post(target_id=tid, linkedin_id=f"urn:li:activity:{n}", author="Test",
+                       text=f"Post {n} " + "long body text " * 100, url="",
+                       media_urls=[f"https://img.com/{n}.jpg"], posted_at="2026-02-14",
+                       commit=False)
+    db.conn.commit()
+    return db
+
+
+def test_maintain_db_reclaims_space_and_reports():
+    db = _populated_db(Path(tempfile.mkdtemp()) / "ai4news.db")
+    db.conn.execute("DELETE FROM posts WHERE id % 2 = 0")
+    db.conn.commit()
+
+    result = maintain_db(db, timing_runs=1)
+    assert result["integrity_ok"]
+    assert result["orphans"]["media"] == 150
+    assert result["orphans_removed"]["media"] == 150
+    assert result["reclaimed_bytes"] > 0
+    assert result["free_pages_after"] == 0
+    assert set(result["get_new_posts_seconds"]) == {"before", "after"}
+    assert db.conn.execute("SELECT COUNT(*) FROM sqlite_stat1").fetchone()[0] > 0
+    db.close()
+
+
+def test_maintain_db_can_keep_orphans():
+    db = _populated_db(Path(tempfile.mkdtemp()) / "ai4news.db", posts=10)
+    db.conn.execute("DELETE FROM posts")
+    db.conn.commit()
+    result = maintain_db(db, clean_orphans=False, timing_runs=1)
+    assert result["orphans"]["bodies"] == 10
+    assert result["orphans_removed"] == {}
+    assert db.find_orphans()["bodies"] == 10
+    db.close()
+
+
+def test_main_prints_report(capsys):
+    path = Path(tempfile.mkdtemp()) / "ai4news.db"
+    _populated_db(path, posts=5).close()
+    assert main(["--db", str(path), "--timing-runs", "1"]) == 0
+    assert '"integrity_ok": true' in capsys.readouterr().out
@@ -1,7 +1,10 @@
 # tests/test_newsletter.py
+import gzip
 import tempfile
 from pathlib import Path
 
+import pytest
+
 from ai4news.newsletter import generate_html, group_posts_by_target
 
 
@@ -98,3 +101,79 @@ def test_generate_html_with_translation():
     assert "这是一段中文内容" in html
     assert "This is Chinese content." in html
     assert "Translation" in html
+
+
+def test_generate_html_uses_media_count():
+    posts = [dict(SAMPLE_POSTS[0], media_count=3)]
+    del posts[0]["media_urls"]
+    output_dir = Path(tempfile.mkdtemp())
+    html = generate_html(posts, output_dir).read_text()
+    assert "3 media" in html
+
+
+def test_generate_html_lists_most_active_targets():
+    stats = [
+        {"target_name": "OpenAI", "posts_this_period": 2, "change": -1},
+        {"target_name": "Satya Nadella", "posts_this_period": 5, "change": 3},
+        {"target_name": "Dormant", "posts_this_period": 0, "change": 0},
+    ]
+    output_dir = Path(tempfile.mkdtemp())
+    html = generate_html(SAMPLE_POSTS, output_dir, stats=stats).read_text()
+    assert "Most active this week" in html
+    assert html.index("Satya Nadella &middot; 5 posts") < html.index("OpenAI &middot; 2 posts")
+    assert "+3 vs previous period" in html
+    assert "Dormant" not in html
+
+
+def test_generate_html_without_stats_has_no_activity_section():
+    output_dir = Path(tempfile.mkdtemp())
+    html = generate_html(SAMPLE_POSTS, output_dir).read_text()
+    assert "Most active this week" not in html
+
+
+def test_generate_html_topic_layout_shows_one_summary_per_topic():
+    posts = [
+        dict(SAMPLE_POSTS[0], topic="copilot, launch"),
+        dict(SAMPLE_POSTS[2], topic="copilot, launch", summary=""),
+        dict(SAMPLE_POSTS[1], topic="hiring"),
+    ]
+    output_dir = Path(tempfile.mkdtemp())
+    html = generate_html(posts, output_dir, layout="topic").read_text()
+    assert "copilot, launch (2 posts)" in html
+    assert "from 2 topics" in html
+    assert SAMPLE_POSTS[0]["summary"].replace("'", "&#39;") in html
+    assert SAMPLE_POSTS[2]["summary"] not in html
+    assert SAMPLE_POSTS[2]["url"] in html
+
+
+def test_generate_html_rejects_unknown_layout():
+    with pytest.raises(ValueError):
+        generate_html(SAMPLE_POSTS, Path(tempfile.mkdtemp()), layout="author")
+
+
+def test_generate_html_inlines_stylesheet_unescaped():
+    html = generate_html(SAMPLE_POSTS, Path(tempfile.mkdtemp())).read_text()
+    assert "'Segoe UI'" in html
+
+
+def test_generate_html_split_writes_index_pages_and_gzip():
+    posts = SAMPLE_POSTS + [dict(SAMPLE_POSTS[2], text="Line one\n\nLine two")]
+    output_dir = Path(tempfile.mkdtemp())
+    index = generate_html(posts, output_dir, split=True)
+    issue = index.parent
+    assert index.name == "index.html"
+    pages = sorted(p.name for p in issue.glob("*.html"))
+    assert pages == ["001-satya-nadella.html", "002-openai.html", "index.html"]
+    for name in pages + ["style.css"]:
+        assert gzip.decompress((issue / (name + ".gz")).read_bytes()) == (issue / name).read_bytes()
+
+    html = index.read_text()
+    assert 'href="style.css"' in html and "<style>" not in html
+    assert 'href="001-satya-nadella.html"' in html
+    assert "Excited about the future of AI." not in html
+    assert "\n" not in html.strip()
+
+    page = (issue / "002-openai.html").read_text()
+    assert "<details open" not in page
+    assert "Line one\n\nLine two" in page
+    assert "OpenAI announces engineering hiring initiative." in page
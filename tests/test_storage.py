@@ -1,13 +1,16 @@
 # tests/test_storage.py
+import sqlite3
 import tempfile
+from datetime import datetime, timedelta
 from pathlib import Path
 
+import pytest
+
 from ai4news.storage import Database
 
 
 def make_db() -> Database:
-    tmp = tempfile.mktemp(suffix=".db")
-    return Database(Path(tmp))
+    return Database(Path(tempfile.mkdtemp()) / "test.db")
 
 
 def test_create_tables():
@@ -122,3 +125,481 @@ def test_record_newsletter():
     db = make_db()
     db.record_newsletter(file_path="/tmp/test.html", post_count=5)
     db.close()
+
+
+def _insert_old_post(db: Database, tid: int, linkedin_id: str, text: str = "Old news") -> None:
+    db.insert_post(
+        target_id=tid,
+        linkedin_id=linkedin_id,
+        author="Test",
+        text=text,
+        url=f"https://linkedin.com/feed/update/{linkedin_id}",
+        media_urls=["https://img.com/old.jpg"],
+        posted_at="2025-01-10T10:00:00",
+    )
+    db.conn.execute(
+        "UPDATE posts SET scraped_at = '2025-01-10 10:00:00' WHERE linkedin_id = ?",
+        (linkedin_id,),
+    )
+    db.conn.commit()
+
+
+def test_archive_posts_moves_old_rows():
+    db = make_db()
+    tid = db.upsert_target(url="https://www.linkedin.com/in/test", target_type="person", name="Test")
+    _insert_old_post(db, tid, "urn:li:activity:old")
+    db.insert_post(
+        target_id=tid, linkedin_id="urn:li:activity:new", author="Test", text="Fresh",
+        url="", media_urls=[], posted_at="2026-02-14T10:00:00",
+    )
+    result = db.archive_posts(older_than_days=90)
+    assert result["archived"] == 1
+    assert result["partitions"] == {"posts-2025-01.ndjson.gz": 1}
+    assert db.conn.execute("SELECT COUNT(*) FROM posts").fetchone()[0] == 1
+
+    # Recent window stays on the hot table; a long window reaches the archive.
+    assert [p["linkedin_id"] for p in db.get_new_posts(since_days=7)] == ["urn:li:activity:new"]
+    posts = db.get_new_posts(since_days=3650)
+    assert [p["linkedin_id"] for p in posts] == ["urn:li:activity:new", "urn:li:activity:old"]
+    assert posts[1]["media_urls"] == ["https://img.com/old.jpg"]
+    assert posts[1]["target_name"] == "Test"
+    db.close()
+
+
+def test_archived_posts_stay_deduplicated_and_searchable():
+    db = make_db()
+    tid = db.upsert_target(url="https://www.linkedin.com/in/test", target_type="person", name="Test")
+    _insert_old_post(db, tid, "urn:li:activity:old", text="Model launch recap")
+    db.archive_posts(older_than_days=90)
+
+    assert db.insert_post(
+        target_id=tid, linkedin_id="urn:li:activity:old", author="Test", text="Again",
+        url="", media_urls=[], posted_at="",
+    ) is False
+    assert db.get_post("urn:li:activity:old")["text"] == "Model launch recap"
+    assert [p["linkedin_id"] for p in db.search_posts("LAUNCH")] == ["urn:li:activity:old"]
+    assert db.search_posts("launch", since_days=7) == []
+    db.close()
+
+
+def test_archived_posts_of_removed_target_do_not_leak_to_reused_id():
+    db = make_db()
+    a = db.upsert_target(url="https://www.linkedin.com/in/a", target_type="person", name="A")
+    b = db.upsert_target(url="https://www.linkedin.com/in/b", target_type="person", name="B")
+    _insert_old_post(db, a, "urn:li:activity:a", text="Launch from A")
+    _insert_old_post(db, b, "urn:li:activity:b", text="Launch from B")
+    db.archive_posts(older_than_days=90)
+
+    assert db.remove_target("https://www.linkedin.com/in/b")
+    c = db.upsert_target(url="https://www.linkedin.com/in/c", target_type="person", name="C")
+    assert c == b
+
+    assert [p["linkedin_id"] for p in db.get_new_posts(since_days=3650)] == ["urn:li:activity:a"]
+    assert [p["linkedin_id"] for p in db.search_posts("launch")] == ["urn:li:activity:a"]
+    assert [(r["linkedin_id"], r["target_url"]) for r in db.iter_archived()] == [
+        ("urn:li:activity:a", "https://www.linkedin.com/in/a")
+    ]
+    assert db.get_post("urn:li:activity:b") is None
+    db.close()
+
+
+def test_media_is_deduplicated_and_counts_skip_decoding():
+    db = make_db()
+    tid = db.upsert_target(url="https://www.linkedin.com/in/test", target_type="person", name="Test")
+    shared = "https://media.licdn.com/shared.jpg"
+    db.insert_post(target_id=tid, linkedin_id="urn:li:activity:1", author="Test", text="a",
+                   url="", media_urls=[shared, "https://img.com/2.jpg"], posted_at="2026-02-14")
+    db.insert_post(target_id=tid, linkedin_id="urn:li:activity:2", author="Test", text="b",
+                   url="", media_urls=[shared], posted_at="2026-02-13")
+    assert db.conn.execute("SELECT COUNT(*) FROM media").fetchone()[0] == 2
+
+    posts = db.get_new_posts(since_days=7)
+    assert posts[0]["media_urls"] == [shared, "https://img.com/2.jpg"]
+    assert posts[1]["media_urls"] == [shared]
+
+    counts = db.get_new_posts(since_days=7, include_media=False)
+    assert [p["media_count"] for p in counts] == [2, 1]
+    assert "media_urls" not in counts[0]
+    db.close()
+
+
+def test_migrates_media_urls_column():
+    path = Path(tempfile.mkdtemp()) / "old.db"
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE targets (id INTEGER PRIMARY KEY, url TEXT UNIQUE NOT NULL,
+                              type TEXT NOT NULL, name TEXT,
+                              created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP);
+        CREATE TABLE posts (id INTEGER PRIMARY KEY,
+                            target_id INTEGER REFERENCES targets(id) ON DELETE CASCADE,
+                            linkedin_id TEXT UNIQUE, author TEXT, text TEXT, url TEXT,
+                            media_urls TEXT, posted_at TIMESTAMP,
+                            scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP);
+        INSERT INTO targets (id, url, type, name) VALUES (1, 'https://x', 'person', 'Old');
+        INSERT INTO posts (target_id, linkedin_id, text, media_urls, posted_at)
+            VALUES (1, 'urn:li:activity:1', 'with media', '["https://a.jpg", "https://b.jpg"]', '2026-02-14');
+        INSERT INTO posts (target_id, linkedin_id, text, media_urls, posted_at)
+            VALUES (1, 'urn:li:activity:2', 'no media', '[]', '2026-02-13');
+    """)
+    conn.close()
+
+    db = Database(path)
+    columns = {row["name"] for row in db.conn.execute("PRAGMA table_info(posts)")}
+    assert "media_urls" not in columns
+    posts = db.get_new_posts(since_days=7)
+    assert posts[0]["media_urls"] == ["https://a.jpg", "https://b.jpg"]
+    assert posts[0]["media_count"] == 2
+    assert posts[0]["text"] == "with media"
+    assert "text" not in columns
+    assert posts[1]["media_urls"] == []
+    db.close()
+
+
+def _make_v6_media_db(path: Path) -> None:
+    db = Database(path)
+    tid = db.upsert_target(url="https://www.linkedin.com/in/test", target_type="person", name="Test")
+    for n, urls in ((1, ["https://b.jpg", "https://a.jpg"]), (2, ["https://a.jpg"])):
+        db.insert_post(target_id=tid, linkedin_id=f"urn:li:activity:{n}", author="Test",
+                       text=f"Post {n}", url="", media_urls=urls, posted_at=f"2026-02-1{n}")
+    # Rebuild the media tables in their schema version 6 layout.
+    db.conn.executescript("""
+        CREATE TABLE media_old (id INTEGER PRIMARY KEY, url TEXT UNIQUE NOT NULL);
+        INSERT INTO media_old (url) SELECT url FROM media ORDER BY url;
+        CREATE TABLE post_media_old (post_id INTEGER NOT NULL, position INTEGER NOT NULL,
+                                     media_id INTEGER NOT NULL, PRIMARY KEY (post_id, position));
+        INSERT INTO post_media_old SELECT pm.post_id, pm.position, m.id
+            FROM post_media pm JOIN media ON media.hash = pm.media_hash
+            JOIN media_old m ON m.url = media.url;
+        DROP TABLE post_media;
+        DROP TABLE media;
+        ALTER TABLE media_old RENAME TO media;
+        ALTER TABLE post_media_old RENAME TO post_media;
+        PRAGMA user_version = 6;
+    """)
+    db.close()
+
+
+def test_migrates_media_to_hash_keys(tmp_path):
+    path = tmp_path / "old.db"
+    _make_v6_media_db(path)
+    db = Database(path)
+    columns = {row["name"] for row in db.conn.execute("PRAGMA table_info(media)")}
+    assert columns == {"hash", "url"}
+    posts = {p["linkedin_id"]: p["media_urls"] for p in db.get_new_posts(since_days=3650)}
+    assert posts == {"urn:li:activity:1": ["https://b.jpg", "https://a.jpg"],
+                     "urn:li:activity:2": ["https://a.jpg"]}
+    assert db.integrity_problems() == []
+    assert db.find_orphans()["media"] == 0
+    db.close()
+
+
+def test_interrupted_media_migration_rolls_back(tmp_path, monkeypatch):
+    path = tmp_path / "old.db"
+    _make_v6_media_db(path)
+
+    def interrupted(url):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(Database, "_media_hash", staticmethod(interrupted))
+    with pytest.raises(KeyboardInterrupt):
+        Database(path)
+    monkeypatch.undo()
+
+    db = Database(path)
+    tables = {r[0] for r in db.conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert "media_v6" not in tables and "post_media_v6" not in tables
+    posts = {p["linkedin_id"]: p["media_urls"] for p in db.get_new_posts(since_days=3650)}
+    assert posts["urn:li:activity:1"] == ["https://b.jpg", "https://a.jpg"]
+    db.close()
+
+
+def test_migrates_post_bodies_to_without_rowid(tmp_path):
+    path = tmp_path / "old.db"
+    db = Database(path)
+    tid = db.upsert_target(url="https://www.linkedin.com/in/test", target_type="person", name="Test")
+    text = "Long post. " * 100
+    db.insert_post(target_id=tid, linkedin_id="urn:li:activity:1", author="Test", text=text,
+                   url="", media_urls=[], posted_at="2026-02-14")
+    # Rebuild post_bodies as the rowid table of schema version 7.
+    db.conn.executescript("""
+        CREATE TABLE post_bodies_old (hash BLOB PRIMARY KEY, codec TEXT NOT NULL, body BLOB NOT NULL);
+        INSERT INTO post_bodies_old SELECT * FROM post_bodies;
+        DROP TABLE post_bodies;
+        ALTER TABLE post_bodies_old RENAME TO post_bodies;
+        PRAGMA user_version = 7;
+    """)
+    db.close()
+
+    db = Database(path)
+    sql = db.conn.execute("SELECT sql FROM sqlite_master WHERE name = 'post_bodies'").fetchone()[0]
+    assert "WITHOUT ROWID" in sql
+    assert db.get_post("urn:li:activity:1")["text"] == text
+    db.close()
+
+
+def test_interrupted_post_bodies_rebuild_rolls_back(tmp_path):
+    path = tmp_path / "old.db"
+    db = Database(path)
+    # A rowid post_bodies whose one row cannot be copied into the new
+    # layout, so the rebuild fails after its RENAME and CREATE.
+    db.conn.executescript("""
+        DROP TABLE post_bodies;
+        CREATE TABLE post_bodies (hash BLOB PRIMARY KEY, codec TEXT, body BLOB);
+        INSERT INTO post_bodies VALUES (x'00', NULL, x'00');
+        PRAGMA user_version = 7;
+    """)
+    db.close()
+
+    with pytest.raises(sqlite3.IntegrityError):
+        Database(path)
+    conn = sqlite3.connect(path)
+    tables = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert "post_bodies_v7" not in tables
+    assert conn.execute("SELECT COUNT(*) FROM post_bodies").fetchone()[0] == 1
+    conn.close()
+
+
+def test_insert_post_accepts_missing_media_urls():
+    db = make_db()
+    tid = db.upsert_target(url="https://www.linkedin.com/in/test", target_type="person", name="Test")
+    assert db.insert_post(target_id=tid, linkedin_id="urn:li:activity:1", author="Test",
+                          text="Hello", url="", media_urls=None, posted_at="2026-02-14")
+    assert db.get_post("urn:li:activity:1")["media_urls"] == []
+    db.close()
+
+
+def test_feed_link_urls_are_rebuilt_not_stored():
+    db = make_db()
+    tid = db.upsert_target(url="https://www.linkedin.com/in/test", target_type="person", name="Test")
+    feed = "https://www.linkedin.com/feed/update/urn:li:activity:1"
+    other = "https://www.linkedin.com/posts/test_activity-2"
+    for n, url in ((1, feed), (2, other)):
+        db.insert_post(target_id=tid, linkedin_id=f"urn:li:activity:{n}", author="Test",
+                       text="Hello", url=url, media_urls=[], posted_at="2026-02-14")
+    stored = dict(db.conn.execute("SELECT linkedin_id, url FROM posts").fetchall())
+    assert stored == {"urn:li:activity:1": None, "urn:li:activity:2": other}
+    assert db.get_post("urn:li:activity:1")["url"] == feed
+    assert [p["url"] for p in db.iter_posts()] == [feed, other]
+    db.close()
+
+
+def test_migration_drops_feed_link_urls(tmp_path):
+    path = tmp_path / "old.db"
+    db = Database(path)
+    tid = db.upsert_target(url="https://www.linkedin.com/in/test", target_type="person", name="Test")
+    db.insert_post(target_id=tid, linkedin_id="urn:li:activity:1", author="Test",
+                   text="Hello", url="", media_urls=[], posted_at="2026-02-14")
+    feed = "https://www.linkedin.com/feed/update/urn:li:activity:1"
+    db.conn.execute("UPDATE posts SET url = ?", (feed,))
+    db.conn.execute("PRAGMA user_version = 8")
+    db.conn.commit()
+    db.close()
+
+    db = Database(path)
+    assert db.conn.execute("SELECT url FROM posts").fetchone()[0] is None
+    assert db.get_post("urn:li:activity:1")["url"] == feed
+    db.close()
+
+
+def _insert(db: Database, tid: int, n: int) -> None:
+    db.insert_post(target_id=tid, linkedin_id=f"urn:li:activity:{n}", author="Test",
+                   text=f"Post {n}", url="", media_urls=[], posted_at=f"2026-02-{n:02d}")
+
+
+def test_since_last_newsletter_returns_only_unpublished():
+    db = make_db()
+    tid = db.upsert_target(url="https://www.linkedin.com/in/test", target_type="person", name="Test")
+    for n in range(1, 5):
+        _insert(db, tid, n)
+    assert len(db.get_new_posts(since_last_newsletter=True)) == 4
+
+    # Issue 1 publishes posts 1, 2 and 4; post 3 was left out.
+    db.record_newsletter("/tmp/1.html", 3, linkedin_ids=[
+        "urn:li:activity:1", "urn:li:activity:2", "urn:li:activity:4",
+    ])
+    _insert(db, tid, 5)
+    unpublished = db.get_new_posts(since_last_newsletter=True)
+    assert sorted(p["linkedin_id"] for p in unpublished) == ["urn:li:activity:3", "urn:li:activity:5"]
+
+    db.record_newsletter("/tmp/2.html", 2, linkedin_ids=[p["linkedin_id"] for p in unpublished])
+    assert db.get_new_posts(since_last_newsletter=True) == []
+    members = db.conn.execute("SELECT COUNT(*) FROM newsletter_posts").fetchone()[0]
+    assert members == 5
+    db.close()
+
+
+def test_since_last_newsletter_sees_reused_post_ids():
+    db = make_db()
+    tid = db.upsert_target(url="https://www.linkedin.com/in/test", target_type="person", name="Test")
+    _insert(db, tid, 1)
+    _insert(db, tid, 2)
+    db.record_newsletter("/tmp/1.html", 2, linkedin_ids=["urn:li:activity:1", "urn:li:activity:2"])
+    # Deleting the newest post lets SQLite hand its id to the next insert.
+    db.conn.execute("DELETE FROM posts WHERE linkedin_id = 'urn:li:activity:2'")
+    db.conn.commit()
+    _insert(db, tid, 3)
+    assert [p["linkedin_id"] for p in db.get_new_posts(since_last_newsletter=True)] == \
+        ["urn:li:activity:3"]
+    db.close()
+
+
+def test_migration_backfills_newsletter_membership():
+    path = Path(tempfile.mkdtemp()) / "old.db"
+    db = Database(path)
+    tid = db.upsert_target(url="https://www.linkedin.com/in/test", target_type="person", name="Test")
+    _insert(db, tid, 1)
+    db.close()
+    # Rewind to a version-1 database with one issue and no membership table.
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        DROP TABLE newsletter_posts;
+        ALTER TABLE newsletters DROP COLUMN unpublished_from;
+        INSERT INTO newsletters (file_path, post_count, created_at)
+            VALUES ('/tmp/old.html', 1, '2999-01-01 00:00:00');
+        PRAGMA user_version = 1;
+    """)
+    conn.close()
+
+    db = Database(path)
+    assert db.get_new_posts(since_last_newsletter=True) == []
+    _insert(db, tid, 2)
+    assert [p["linkedin_id"] for p in db.get_new_posts(since_last_newsletter=True)] == \
+        ["urn:li:activity:2"]
+    db.close()
+
+
+def test_post_bodies_are_shared_and_decoded_on_demand():
+    db = make_db()
+    tid = db.upsert_target(url="https://www.linkedin.com/in/test", target_type="person", name="Test")
+    body = "We just launched our new reasoning model. " * 20
+    for n in (1, 2):
+        db.insert_post(target_id=tid, linkedin_id=f"urn:li:activity:{n}", author="Test",
+                       text=body, url="", media_urls=[], posted_at=f"2026-02-1{n}")
+    assert db.conn.execute("SELECT COUNT(*) FROM post_bodies").fetchone()[0] == 1
+    stored = db.conn.execute("SELECT length(body) FROM post_bodies").fetchone()[0]
+    assert stored < len(body)
+
+    posts = db.get_new_posts(since_days=7)
+    assert posts[0]["text"] == body
+    previews = db.get_new_posts(since_days=7, include_text=False)
+    assert "text" not in previews[0]
+    assert previews[0]["preview"] == body[:200]
+    assert previews[0]["text_length"] == len(body)
+
+    db.remove_target("https://www.linkedin.com/in/test")
+    assert db.conn.execute("SELECT COUNT(*) FROM post_bodies").fetchone()[0] == 0
+    db.close()
+
+
+def test_target_stats_follow_inserts_and_deletes():
+    db = make_db()
+    busy = db.upsert_target(url="https://www.linkedin.com/in/busy", target_type="person", name="Busy")
+    quiet = db.upsert_target(url="https://www.linkedin.com/in/quiet", target_type="person", name="Quiet")
+    today = datetime.now()
+    for n in range(4):
+        db.insert_post(target_id=busy, linkedin_id=f"urn:li:activity:{n}", author="Busy",
+                       text="x" * 100, url="", media_urls=["https://img.com/a.jpg"] if n == 0 else [],
+                       posted_at=(today - timedelta(days=n)).strftime("%Y-%m-%d"))
+    db.insert_post(target_id=quiet, linkedin_id="urn:li:activity:10", author="Quiet", text="y" * 50,
+                   url="", media_urls=[], posted_at=(today - timedelta(days=10)).strftime("%Y-%m-%d"))
+
+    stats = db.get_target_stats(days=7)
+    assert [s["target_name"] for s in stats] == ["Busy", "Quiet"]
+    assert stats[0]["post_count"] == 4
+    assert stats[0]["avg_length"] == 100
+    assert stats[0]["media_ratio"] == 0.25
+    assert stats[0]["posts_this_period"] == 4
+    assert stats[0]["change"] == 4
+    assert stats[1]["posts_this_period"] == 0
+    assert stats[1]["posts_previous_period"] == 1
+
+    db.conn.execute("DELETE FROM posts WHERE linkedin_id = 'urn:li:activity:0'")
+    db.conn.commit()
+    busy_stats = db.get_target_stats(days=7)[0]
+    assert busy_stats["post_count"] == 3
+    assert busy_stats["media_ratio"] == 0
+    assert busy_stats["last_post_at"] == (today - timedelta(days=1)).strftime("%Y-%m-%d 00:00:00")
+
+    before = db.get_target_stats(days=7)
+    db.rebuild_target_stats()
+    assert db.get_target_stats(days=7) == before
+    db.close()
+
+
+def test_term_df_counts_each_post_once():
+    db = make_db()
+    tid = db.upsert_target(url="https://www.linkedin.com/in/test", target_type="person", name="Test")
+    texts = ["OpenAI ships GPT-5 reasoning", "GPT-5 reasoning GPT-5 again", "Hiring in Berlin"]
+    for n, text in enumerate(texts):
+        db.insert_post(target_id=tid, linkedin_id=f"urn:li:activity:{n}", author="Test",
+                       text=text, url="", media_urls=[], posted_at="2026-02-14")
+    db.insert_post(target_id=tid, linkedin_id="urn:li:activity:0", author="Test",
+                   text=texts[0], url="", media_urls=[], posted_at="2026-02-14")
+    df, documents = db.term_df({"gpt-5", "berlin", "unseen"})
+    assert documents == 3
+    assert df == {"gpt-5": 2, "berlin": 1}
+
+    topics = db.get_topic_clusters(since_days=7)
+    assert len(topics[0]["posts"]) == 2
+    assert "gpt-5" in topics[0]["terms"]
+    db.close()
+
+
+def test_new_and_migrated_databases_use_incremental_vacuum(tmp_path):
+    db = make_db()
+    assert db.conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+    db.close()
+
+    path = tmp_path / "old.db"
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE targets (id INTEGER PRIMARY KEY, url TEXT UNIQUE NOT NULL, type TEXT NOT NULL)")
+    conn.execute("PRAGMA user_version = 5")
+    conn.commit()
+    conn.close()
+    db = Database(path)
+    assert db.conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+    db.close()
+
+
+def test_configure_does_not_wait_for_writers(tmp_path):
+    path = tmp_path / "test.db"
+    db = Database(path)
+    writer = sqlite3.connect(path, isolation_level=None)
+    writer.execute("BEGIN IMMEDIATE")
+    writer.execute("INSERT INTO targets (url, type) VALUES ('https://x', 'person')")
+    db.conn.execute("PRAGMA busy_timeout = 0")
+    db._configure()
+    assert db.conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+    writer.rollback()
+    writer.close()
+    db.close()
+
+
+def test_opening_a_current_database_does_not_wait_for_writers(tmp_path, monkeypatch):
+    path = tmp_path / "test.db"
+    Database(path).close()
+    writer = sqlite3.connect(path, isolation_level=None)
+    writer.execute("BEGIN IMMEDIATE")
+    writer.execute("INSERT INTO targets (url, type) VALUES ('https://x', 'person')")
+    monkeypatch.setattr("ai4news.storage.BUSY_TIMEOUT_SECONDS", 0.0)
+    db = Database(path)
+    assert db.list_targets() == []
+    db.close()
+    writer.rollback()
+    writer.close()
+
+
+def test_remove_target_cascades():
+    db = make_db()
+    tid = db.upsert_target(url="https://www.linkedin.com/in/test", target_type="person", name="Test")
+    db.insert_post(target_id=tid, linkedin_id="urn:li:activity:1", author="Test", text="Hello",
+                   url="", media_urls=["https://img.com/a.jpg"], posted_at="2026-02-14")
+    db.record_newsletter("a.html", 1, linkedin_ids=["urn:li:activity:1"])
+    db.remove_target("https://www.linkedin.com/in/test")
+    for table in ("posts", "post_media", "newsletter_posts", "target_stats", "target_daily_stats"):
+        assert db.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] == 0
+    assert db.find_orphans()["media"] == 1
+    assert db.delete_orphans() == {"bodies": 0, "media": 1}
+    assert db.find_orphans()["media"] == 0
+    assert db.integrity_problems() == []
+    db.close()
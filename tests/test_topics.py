@@ -0,0 +1,61 @@
+# tests/test_topics.py
+import pytest
+
+from ai4news import topics
+from ai4news.topics import cluster_posts, similarities, tfidf_vectors, tokenize
+
+LAUNCH = [
+    "OpenAI released GPT-5 with stronger reasoning and a bigger context window.",
+    "GPT-5 is out: OpenAI says reasoning benchmarks improved across the board.",
+    "Trying the new GPT-5 reasoning model from OpenAI on our coding agents.",
+]
+OTHER = [
+    "We are hiring backend engineers in Berlin to scale our payments platform.",
+    "Quarterly earnings: revenue grew on cloud subscriptions and payments volume.",
+]
+
+
+def _posts(texts):
+    return [{"linkedin_id": f"urn:li:activity:{i}", "text": t} for i, t in enumerate(texts)]
+
+
+def test_tokenize_drops_stopwords_and_numbers():
+    assert tokenize("The GPT-5 launch, in 2026, is here!") == ["gpt-5", "launch"]
+
+
+def test_cluster_posts_groups_one_story():
+    clusters = cluster_posts(_posts(LAUNCH + OTHER), df={}, documents=0)
+    assert len(clusters[0]["posts"]) == 3
+    assert {p["linkedin_id"] for p in clusters[0]["posts"]} == {
+        "urn:li:activity:0", "urn:li:activity:1", "urn:li:activity:2"}
+    assert clusters[0]["representative"] in clusters[0]["posts"]
+    assert "gpt-5" in clusters[0]["terms"]
+    assert [c["topic_id"] for c in clusters] == list(range(1, len(clusters) + 1))
+    assert sum(len(c["posts"]) for c in clusters) == 5
+
+
+def test_common_terms_weigh_less():
+    texts = ["payments platform launch", "payments reasoning model"]
+    rare = tfidf_vectors(texts, df={}, documents=100)
+    common = tfidf_vectors(texts, df={"payments": 100}, documents=100)
+    assert common[0]["payments"] < rare[0]["payments"]
+
+
+def test_sparse_similarities_match_dot_products(monkeypatch):
+    vectors = tfidf_vectors(LAUNCH + OTHER, df={}, documents=0)
+    monkeypatch.setattr(topics, "np", None)
+    sparse = similarities(vectors)
+    for i, row in enumerate(sparse):
+        assert abs(row[i] - 1.0) < 1e-9
+        for j, value in enumerate(row):
+            expected = sum(w * vectors[j].get(t, 0.0) for t, w in vectors[i].items())
+            assert abs(value - expected) < 1e-9
+
+
+@pytest.mark.skipif(topics.np is None, reason="numpy is not installed")
+def test_numpy_similarities_match_sparse():
+    vectors = tfidf_vectors(LAUNCH + OTHER + [""], df={}, documents=0)
+    dense = topics._similarities_numpy(vectors)
+    sparse = topics._similarities_sparse(vectors)
+    for row, expected in zip(dense, sparse):
+        assert all(abs(a - b) < 1e-9 for a, b in zip(row, expected))
@@ -0,0 +1,118 @@
+# tests/test_transfer.py
+import gzip
+import json
+from pathlib import Path
+
+import pytest
+
+from ai4news.storage import Database
+from ai4news.transfer import export_store, import_store
+
+
+def make_source(tmp_path: Path) -> Database:
+    (tmp_path / "src").mkdir()
+    db = Database(tmp_path / "src" / "src.db")
+    tid = db.upsert_target(url="https://www.linkedin.com/in/test", target_type="person", name="Test")
+    for i in range(5):
+        db.insert_post(
+            target_id=tid, linkedin_id=f"urn:li:activity:{i}", author="Test", text=f"Post {i}",
+            url="", media_urls=[f"https://img.com/{i}.jpg"] if i % 2 else [],
+            posted_at=f"2026-02-1{i}T10:00:00",
+        )
+    db.record_newsletter(file_path="/tmp/issue.html", post_count=1,
+                         linkedin_ids=["urn:li:activity:0"])
+    return db
+
+
+def export_to(db: Database, path: Path) -> dict:
+    with open(path, "wb") as out:
+        return export_store(db, out)
+
+
+def test_export_writes_every_kind(tmp_path):
+    src = make_source(tmp_path)
+    path = tmp_path / "export.ndjson"
+    counts = export_to(src, path)
+    assert counts == {"target": 1, "post": 5, "archived_post": 0, "newsletter": 1}
+    kinds = [json.loads(line)["kind"] for line in path.read_text().splitlines()]
+    assert kinds[0] == "header"
+    assert kinds.count("post") == 5
+    src.close()
+
+
+def test_round_trip(tmp_path):
+    src = make_source(tmp_path)
+    path = tmp_path / "export.ndjson.gz"
+    with gzip.open(path, "wb") as out:
+        export_store(src, out)
+    dest = Database(tmp_path / "dest.db")
+    result = import_store(dest, path, batch_size=2)
+    assert result["new_posts"] == 5
+    assert result["errors"] == []
+    assert {p["linkedin_id"]: p["media_urls"] for p in dest.iter_posts()} == \
+        {p["linkedin_id"]: p["media_urls"] for p in src.iter_posts()}
+    assert [n["linkedin_ids"] for n in dest.iter_newsletters()] == [["urn:li:activity:0"]]
+    assert len(dest.get_new_posts(since_last_newsletter=True)) == 4
+
+    # Importing into a fresh cursor again adds nothing new.
+    again = import_store(dest, path, restart=True)
+    assert again["new_posts"] == 0
+    assert len(list(dest.iter_newsletters())) == 1
+    src.close()
+    dest.close()
+
+
+def test_import_resumes_after_interruption(tmp_path, monkeypatch):
+    src = make_source(tmp_path)
+    path = tmp_path / "export.ndjson"
+    export_to(src, path)
+    dest_path = tmp_path / "dest.db"
+
+    dest = Database(dest_path)
+    original = Database.insert_post
+    calls = {"n": 0}
+
+    def flaky(self, *args, **kwargs):
+        calls["n"] += 1
+        if calls["n"] == 4:
+            raise KeyboardInterrupt
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(Database, "insert_post", flaky)
+    with pytest.raises(KeyboardInterrupt):
+        import_store(dest, path, batch_size=2)
+    dest.close()
+    monkeypatch.setattr(Database, "insert_post", original)
+
+    dest = Database(dest_path)
+    committed = dest.conn.execute("SELECT COUNT(*) FROM posts").fetchone()[0]
+    result = import_store(dest, path, batch_size=2)
+    assert result["resumed_at"] > 0
+    assert committed + result["new_posts"] == 5
+    assert result["skipped"] == 0
+    assert dest.conn.execute("SELECT COUNT(*) FROM posts").fetchone()[0] == 5
+    src.close()
+    dest.close()
+
+
+def test_reimport_after_completion_starts_over(tmp_path):
+    src = make_source(tmp_path)
+    path = tmp_path / "export.ndjson"
+    export_to(src, path)
+    dest = Database(tmp_path / "dest.db")
+    assert import_store(dest, path, batch_size=2)["new_posts"] == 5
+    assert dest.get_import_progress(str(path.resolve())) is None
+
+    # A later export to the same path is read from the top, not from the
+    # offset the finished import reached.
+    src.insert_post(
+        target_id=src.list_targets()[0]["id"], linkedin_id="urn:li:activity:5", author="Test",
+        text="Post 5", url="", media_urls=[], posted_at="2026-02-16T10:00:00",
+    )
+    export_to(src, path)
+    again = import_store(dest, path, batch_size=2)
+    assert again["resumed_at"] == 0
+    assert again["errors"] == []
+    assert (again["new_posts"], again["skipped"]) == (1, 5)
+    src.close()
+    dest.close()